@@ -0,0 +1,113 @@
+"""Memory and setup-time benchmark for BWT Perla entities.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python benchmarks/bench_entities.py [--devices N]
+
+Coordinators for N devices are built first and are not measured. Then the
+sensor and binary sensor entities of every device are created the way the
+platforms do, and the time and memory this takes are reported in total and
+per device.
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+DATA = {
+    "online": True,
+    "standby": False,
+    "wifi_signal": -60,
+    "pressure": 3.5,
+    "water_increment": 0,
+    "water_consumption": 250,
+}
+
+
+def _build_entities(coordinators) -> list:
+    from custom_components.bwt_perla.binary_sensor import (
+        BINARY_SENSOR_DESCRIPTIONS,
+        BWTBinarySensor,
+    )
+    from custom_components.bwt_perla.sensor import SENSOR_DESCRIPTIONS, BWTSensor
+
+    entities = []
+    for coordinator in coordinators:
+        entities.extend(
+            BWTSensor(coordinator, description) for description in SENSOR_DESCRIPTIONS
+        )
+        entities.extend(
+            BWTBinarySensor(coordinator, description)
+            for description in BINARY_SENSOR_DESCRIPTIONS
+        )
+    return entities
+
+
+async def bench_entities(devices: int) -> None:
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.bwt_perla.coordinator import BWTDataUpdateCoordinator
+    from custom_components.bwt_perla.scheduler import BWTPollScheduler
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        scheduler = BWTPollScheduler()
+        coordinators = []
+        for index in range(devices):
+            entry = SimpleNamespace(
+                entry_id=f"bench{index}",
+                title=f"bench{index}",
+                data={
+                    "username": "u",
+                    "password": "p",
+                    "serial_number": f"BENCH-{index:04d}",
+                },
+                options={},
+                pref_disable_polling=False,
+            )
+            coordinator = BWTDataUpdateCoordinator(hass, entry, scheduler)
+            coordinator.data = dict(DATA)
+            coordinators.append(coordinator)
+
+        # Warm up imports and description construction
+        _build_entities(coordinators[:1])
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        start = time.perf_counter()
+        entities = _build_entities(coordinators)
+        elapsed = time.perf_counter() - start
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        allocated = sum(
+            stat.size_diff for stat in after.compare_to(before, "filename")
+        )
+        print(
+            f"{devices} devices, {len(entities)} entities: "
+            f"{elapsed * 1000:.1f} ms ({elapsed / devices * 1e6:.0f} us/device), "
+            f"{allocated / 1024:.0f} KiB ({allocated / devices / 1024:.1f} KiB/device)"
+        )
+
+        for coordinator in coordinators:
+            await coordinator._session.close()
+        await hass.async_stop(force=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(bench_entities(args.devices))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Import-time and setup-time benchmark for the BWT Perla integration.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python benchmarks/bench_startup.py [--rounds N]
+
+Import time is measured in a fresh interpreter per round, after the Home
+Assistant core modules are loaded (as they are during a real boot). Every
+import Home Assistant performs for a loaded entry is timed, in its order:
+the package, then the coordinator and bs4 from async_setup_entry, then the
+sensor and binary_sensor platforms. Home Assistant helpers first pulled in
+by these modules count towards them. Setup time covers building the
+coordinator and running one update cycle against canned cloud data, so no
+network access is needed.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Imported by Home Assistant for a loaded entry, in this order
+IMPORTED_MODULES = (
+    "custom_components.bwt_perla",
+    "custom_components.bwt_perla.coordinator",
+    "bs4",
+    "custom_components.bwt_perla.sensor",
+    "custom_components.bwt_perla.binary_sensor",
+)
+
+_IMPORT_PROBE = """
+import importlib, json, sys, time
+import aiohttp
+import homeassistant.config_entries, homeassistant.core, homeassistant.const
+timings = {}
+for name in sys.argv[1:]:
+    start = time.perf_counter()
+    importlib.import_module(name)
+    timings[name] = time.perf_counter() - start
+    if name == "custom_components.bwt_perla":
+        timings["bs4 at package import"] = "bs4" in sys.modules
+print(json.dumps(timings))
+"""
+
+MAIN_DATA = {
+    "online": True,
+    "standby": False,
+    "salt": 90,
+    "resin_vol": 10,
+    "in_hardness": 30,
+    "out_hardness": 8,
+    "pressure": 3.5,
+    "vol_ok": 1200,
+    "wifi_signal": -60,
+}
+
+CONSUMPTION_DATA = {
+    "salt_per_regen": 90,
+    "last_date": "2026-01-01",
+    "regen_count": 1,
+    "power_outage": False,
+    "water_consumption": 250,
+    "salt_alarm": False,
+    "salt_consumption": 90,
+}
+
+
+def bench_import(rounds: int) -> None:
+    """Time the imports of a loaded entry in fresh interpreters."""
+    samples: dict[str, list[float]] = {name: [] for name in IMPORTED_MODULES}
+    totals = []
+    bs4_at_package_import = False
+    for _ in range(rounds):
+        timings = json.loads(
+            subprocess.run(
+                [sys.executable, "-c", _IMPORT_PROBE, *IMPORTED_MODULES],
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        )
+        bs4_at_package_import |= timings.pop("bs4 at package import")
+        for name, elapsed in timings.items():
+            samples[name].append(elapsed)
+        totals.append(sum(timings.values()))
+
+    for name, values in samples.items():
+        print(f"import {name}: median {statistics.median(values) * 1000:.2f} ms")
+    print(
+        f"import total: median {statistics.median(totals) * 1000:.2f} ms, "
+        f"max {max(totals) * 1000:.2f} ms over {rounds} rounds "
+        f"(bs4 imported with the package: {bs4_at_package_import})"
+    )
+
+
+async def _setup_once(hass) -> float:
+    from custom_components.bwt_perla.coordinator import BWTDataUpdateCoordinator
+    from custom_components.bwt_perla.scheduler import BWTPollScheduler
+
+    entry = SimpleNamespace(
+        entry_id="bench",
+        title="bench",
+        data={"username": "u", "password": "p", "serial_number": "BENCH-0001"},
+        options={},
+        pref_disable_polling=False,
+    )
+
+    start = time.perf_counter()
+    coordinator = BWTDataUpdateCoordinator(hass, entry, BWTPollScheduler())
+
+    async def _authenticate():
+        return "receipt-line-key"
+
+    async def _get_main_data(_key):
+        return dict(MAIN_DATA)
+
+    async def _get_consumption_data(_key):
+        return dict(CONSUMPTION_DATA)
+
+    coordinator.api.authenticate = _authenticate
+    coordinator.api.get_main_data = _get_main_data
+    coordinator.api.get_consumption_data = _get_consumption_data
+
+    coordinator.data = await coordinator._async_update_data()
+    elapsed = time.perf_counter() - start
+    await coordinator._session.close()
+    return elapsed
+
+
+async def bench_setup(rounds: int) -> None:
+    """Time coordinator construction plus one update cycle."""
+    from homeassistant.core import HomeAssistant
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        samples = [await _setup_once(hass) for _ in range(rounds)]
+        await hass.async_stop(force=True)
+
+    print(
+        f"setup: median {statistics.median(samples) * 1000:.2f} ms, "
+        f"max {max(samples) * 1000:.2f} ms over {rounds} rounds"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    bench_import(args.rounds)
+    asyncio.run(bench_setup(args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,82 @@
 """BWT Perla integration for Home Assistant."""
+from __future__ import annotations
+
+import importlib
 import logging
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.const import Platform
+from typing import TYPE_CHECKING
+
+from .const import (
+    DOMAIN,
+    DATA_SCHEDULER,
+    SERVICE_PROFILE,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_CYCLES,
+    ATTR_TOP,
+    DEFAULT_PROFILE_CYCLES,
+    DEFAULT_PROFILE_TOP,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
 
-from .const import DOMAIN
-from .coordinator import BWTDataUpdateCoordinator
+# Home Assistant is only imported for type checking, lazily below, or when
+# available, so that the API client and the fleet poller can be used as a
+# plain library.
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant, ServiceCall
+    from homeassistant.helpers.typing import ConfigType
+
+try:
+    from homeassistant.helpers import config_validation as cv
+except ImportError:  # used as a plain library, outside Home Assistant
+    cv = None
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR]
+PLATFORMS = ["sensor", "binary_sensor"]
+
+if cv is not None:
+    CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the BWT Perla services."""
+    _async_register_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up BWT Perla from a config entry."""
-    hass.data.setdefault(DOMAIN, {})
+    # The coordinator (and with it Home Assistant's helpers) is imported here
+    # to keep this package usable as a plain library. Import it, and bs4 for
+    # the first fetch, in the import executor rather than on the event loop.
+    coordinator_module = await hass.async_add_import_executor_job(
+        importlib.import_module, f"{__package__}.coordinator"
+    )
+    await hass.async_add_import_executor_job(importlib.import_module, "bs4")
+    from .scheduler import BWTPollScheduler
 
-    coordinator = BWTDataUpdateCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_SCHEDULER not in domain_data:
+        domain_data[DATA_SCHEDULER] = BWTPollScheduler()
+    scheduler = domain_data[DATA_SCHEDULER]
+    scheduler.register(entry.entry_id)
+
+    coordinator = coordinator_module.BWTDataUpdateCoordinator(hass, entry, scheduler)
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        # async_unload_entry is not called for an entry that failed setup
+        await coordinator.async_shutdown()
+        _release_slot(hass, entry)
+        raise
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
@@ -34,4 +88,81 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         coordinator = hass.data[DOMAIN].pop(entry.entry_id)
         await coordinator.async_shutdown()
 
+        _release_slot(hass, entry)
+
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the entry's stored consumption history and event watermark."""
+    from homeassistant.helpers.storage import Store
+
+    await Store(
+        hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id)
+    ).async_remove()
+
+
+def _release_slot(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Free the entry's poll slot; drop the scheduler after the last one."""
+    scheduler = hass.data[DOMAIN][DATA_SCHEDULER]
+    scheduler.unregister(entry.entry_id)
+    if not scheduler.entries:
+        hass.data[DOMAIN].pop(DATA_SCHEDULER)
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply option changes to the running coordinator without a reload."""
+    hass.data[DOMAIN][entry.entry_id].async_apply_options()
+
+
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+    import voluptuous as vol
+    from homeassistant.config_entries import ConfigEntryState
+    from homeassistant.exceptions import ServiceValidationError
+
+    profile_schema = vol.Schema(
+        {
+            vol.Optional(ATTR_CONFIG_ENTRY_ID): str,
+            vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=100)
+            ),
+            vol.Optional(ATTR_TOP, default=DEFAULT_PROFILE_TOP): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=500)
+            ),
+        }
+    )
+
+    async def async_handle_profile(call: ServiceCall) -> None:
+        """Arm profiling of the next update cycles of one or all entries."""
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+
+        if entry_id:
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if (
+                entry is None
+                or entry.domain != DOMAIN
+                or entry.state is not ConfigEntryState.LOADED
+            ):
+                raise ServiceValidationError(
+                    f"{entry_id} is not a loaded BWT Perla config entry",
+                    translation_domain=DOMAIN,
+                    translation_key="entry_not_loaded",
+                    translation_placeholders={"config_entry_id": entry_id},
+                )
+            entries = [entry]
+        else:
+            entries = [
+                entry
+                for entry in hass.config_entries.async_entries(DOMAIN)
+                if entry.state is ConfigEntryState.LOADED
+            ]
+
+        for entry in entries:
+            hass.data[DOMAIN][entry.entry_id].start_profiling(
+                call.data[ATTR_CYCLES], call.data[ATTR_TOP]
+            )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_handle_profile, schema=profile_schema
+    )
@@ -1,14 +1,19 @@
 """Async API client for BWT Mon Service cloud."""
+import asyncio
+import contextlib
 import logging
 import json
 import re
+import time
 import html as html_lib
-from datetime import datetime
+from datetime import datetime, timezone
 
 import aiohttp
-from bs4 import BeautifulSoup
 
-from homeassistant.util import dt as dt_util
+try:
+    from homeassistant.util import dt as dt_util
+except ImportError:  # used as a plain library, outside Home Assistant
+    dt_util = None
 
 from .const import (
     BWT_BASE_URL,
@@ -22,6 +27,27 @@ _LOGGER = logging.getLogger(__name__)
 
 CONNECT_TIMEOUT = aiohttp.ClientTimeout(connect=10, total=30)
 
+_DEVICE_LINK_RE = re.compile(r"/device\?receiptLineKey=")
+_RECEIPT_LINE_KEY_RE = re.compile(r"receiptLineKey=([^&]+)")
+
+# product-summary dataCategories code -> result key
+_CODE_MAPPING = {
+    "resinVol": "resin_vol",
+    "inHardness": "in_hardness",
+    "outHardness": "out_hardness",
+    "pressure": "pressure",
+    "salt": "salt",
+    "volOK": "vol_ok",
+    "rssiLevel": "wifi_signal",
+}
+
+_DATETIME_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d",
+)
+
 
 class BwtApiError(Exception):
     """Base exception for BWT API errors."""
@@ -43,79 +69,160 @@ class BwtCloudApi:
         session: aiohttp.ClientSession,
         username: str,
         password: str,
-        serial_number: str,
+        serial_number: str | None = None,
+        capture=None,
+        limiter=None,
     ) -> None:
         self._session = session
         self._username = username
         self._password = password
         self._serial_number = serial_number
         self._authenticated = False
+        # Bumped on every successful login; lets concurrent callers that hit
+        # an expired session share a single re-login.
+        self._login_generation = 0
+        self._login_lock = asyncio.Lock()
+        # Called with a label right after each page is parsed, while the
+        # parse tree is still alive; used by the profiling service.
+        self.parse_observer = None
+        # Optional capture.TrafficRecorder; every request is recorded to it
+        self.capture = capture
+        # Optional async context manager entered around every HTTP request,
+        # logins included; the fleet poller uses it for its global limits.
+        self.limiter = limiter
 
     async def authenticate(self) -> str:
         """Login and return the receipt_line_key for the configured device.
 
         Raises BwtAuthError on bad credentials, BwtConnectionError on network issues.
         """
-        try:
-            resp = await self._session.post(
-                BWT_LOGIN_URL,
-                data={"_username": self._username, "_password": self._password},
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=CONNECT_TIMEOUT,
+        if not self._serial_number:
+            raise BwtApiError("No serial number configured")
+
+        await self.login()
+
+        keys = await self.find_receipt_line_keys([self._serial_number])
+        if self._serial_number not in keys:
+            raise BwtApiError(
+                f"Serial number {self._serial_number} not found in dashboard"
             )
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise BwtConnectionError(f"Cannot connect to BWT service: {err}") from err
+        return keys[self._serial_number]
 
+    async def login(self) -> None:
+        """Open a session with the configured credentials.
+
+        Raises BwtAuthError on bad credentials, BwtConnectionError on network issues.
+        """
+        resp = await self._send(
+            "POST",
+            BWT_LOGIN_URL,
+            "Cannot connect to BWT service",
+            data={"_username": self._username, "_password": self._password},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
         if resp.status in (401, 403):
             raise BwtAuthError("Authentication failed: invalid credentials")
         if resp.status != 200:
             raise BwtApiError(f"Unexpected status {resp.status} during login")
 
         self._authenticated = True
+        self._login_generation += 1
         _LOGGER.info("BWT authentication successful")
 
-        # Fetch dashboard to find receipt_line_key for our serial number
+    async def _relogin(self, generation: int) -> None:
+        """Log in again unless another caller already did since `generation`."""
+        async with self._login_lock:
+            if self._login_generation != generation:
+                return
+            _LOGGER.debug("BWT session expired, logging in again")
+            await self.login()
+
+    async def _send(self, method: str, url: str, error: str, **kwargs):
+        """Send one request, recording it when capture is enabled.
+
+        Raises BwtConnectionError, prefixed with `error`, on network issues.
+        """
         try:
-            resp = await self._session.get(
-                BWT_DASHBOARD_URL, timeout=CONNECT_TIMEOUT
-            )
+            async with self.limiter or contextlib.nullcontext():
+                started = time.monotonic()
+                resp = await self._session.request(
+                    method, url, timeout=CONNECT_TIMEOUT, **kwargs
+                )
+                if self.capture is not None:
+                    # Buffer the body now; aiohttp keeps it for later reads
+                    body = await resp.read()
         except (aiohttp.ClientError, TimeoutError) as err:
-            raise BwtConnectionError(f"Cannot fetch dashboard: {err}") from err
+            if self.capture is not None:
+                await self.capture.async_record(
+                    method, url, kwargs, started, self._secrets(), error=err
+                )
+            raise BwtConnectionError(f"{error}: {err}") from err
+
+        if self.capture is not None:
+            await self.capture.async_record(
+                method, url, kwargs, started, self._secrets(), resp=resp, body=body
+            )
+        return resp
+
+    def _secrets(self) -> tuple[str, ...]:
+        return (self._username, self._password)
+
+    async def _request(self, method: str, url: str, error: str, **kwargs):
+        """Send a request, logging in again and retrying once on 401/403.
+
+        The receipt_line_key stays valid across logins, so only the login
+        itself is repeated, never the dashboard scrape.
+        """
+        for attempt in range(2):
+            generation = self._login_generation
+            resp = await self._send(method, url, error, **kwargs)
+            if resp.status not in (401, 403):
+                return resp
+
+            self._authenticated = False
+            if attempt:
+                break
+            await self._relogin(generation)
+
+        raise BwtAuthError("Session expired")
+
+    async def find_receipt_line_keys(
+        self, serial_numbers: list[str]
+    ) -> dict[str, str]:
+        """Scrape the dashboard once and map serial numbers to receipt_line_keys.
+
+        Serial numbers that are not on the account's dashboard are left out.
+        """
+        resp = await self._send("GET", BWT_DASHBOARD_URL, "Cannot fetch dashboard")
 
         text = await resp.text()
-        soup = BeautifulSoup(text, "html.parser")
+        soup = _parse_html(text)
+        if self.parse_observer:
+            self.parse_observer("dashboard")
+
+        wanted = {serial: re.compile(re.escape(serial)) for serial in serial_numbers}
+        keys: dict[str, str] = {}
 
-        links = soup.find_all("a", href=re.compile(r"/device\?receiptLineKey="))
+        links = soup.find_all("a", href=_DEVICE_LINK_RE)
         for link in links:
             info_div = link.find("div", class_="informations")
-            if info_div:
-                serial_span = info_div.find(
-                    "span", string=re.compile(self._serial_number)
-                )
-                if serial_span:
-                    href = link.get("href")
-                    match = re.search(r"receiptLineKey=([^&]+)", href)
-                    if match:
-                        key = match.group(1)
-                        _LOGGER.info("Receipt line key found: %s", key)
-                        return key
-
-        raise BwtApiError(
-            f"Serial number {self._serial_number} not found in dashboard"
-        )
+            if not info_div:
+                continue
+            for serial, pattern in wanted.items():
+                if serial in keys or not info_div.find("span", string=pattern):
+                    continue
+                match = _RECEIPT_LINE_KEY_RE.search(link.get("href"))
+                if match:
+                    keys[serial] = match.group(1)
+                    _LOGGER.info("Receipt line key found: %s", keys[serial])
+
+        return keys
 
     async def get_main_data(self, receipt_line_key: str) -> dict:
         """Fetch main device data from the product-summary endpoint."""
         url = f"{BWT_SUMMARY_URL}/{receipt_line_key}"
 
-        try:
-            resp = await self._session.get(url, timeout=CONNECT_TIMEOUT)
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise BwtConnectionError(f"Cannot fetch main data: {err}") from err
-
-        if resp.status in (401, 403):
-            self._authenticated = False
-            raise BwtAuthError("Session expired")
+        resp = await self._request("GET", url, "Cannot fetch main data")
         if resp.status != 200:
             raise BwtApiError(f"Main data request failed with status {resp.status}")
 
@@ -127,27 +234,16 @@ class BwtCloudApi:
             "salt": data.get("data", {}).get("salt"),
         }
 
-        code_mapping = {
-            "resinVol": "resin_vol",
-            "inHardness": "in_hardness",
-            "outHardness": "out_hardness",
-            "pressure": "pressure",
-            "salt": "salt",
-            "volOK": "vol_ok",
-            "rssiLevel": "wifi_signal",
-        }
-
         categories = data.get("dataCategories", {})
         for _category_name, category_data in categories.items():
             if isinstance(category_data, list):
                 for item in category_data:
                     code = item.get("code")
                     value = item.get("value")
-                    if code and value is not None and code in code_mapping:
-                        result[code_mapping[code]] = value
-                        _LOGGER.debug(
-                            "Mapped '%s' -> '%s': %s", code, code_mapping[code], value
-                        )
+                    key = _CODE_MAPPING.get(code)
+                    if key and value is not None:
+                        result[key] = value
+                        _LOGGER.debug("Mapped '%s' -> '%s': %s", code, key, value)
 
         _LOGGER.debug("Main data retrieved: %s", result)
         return result
@@ -156,23 +252,18 @@ class BwtCloudApi:
         """Fetch consumption data by scraping the device page and calling loadConso."""
         device_url = f"{BWT_BASE_URL}/device?receiptLineKey={receipt_line_key}"
 
-        try:
-            resp = await self._session.get(device_url, timeout=CONNECT_TIMEOUT)
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise BwtConnectionError(
-                f"Cannot fetch device page: {err}"
-            ) from err
-
-        if resp.status in (401, 403):
-            self._authenticated = False
-            raise BwtAuthError("Session expired")
+        resp = await self._request(
+            "GET", device_url, "Cannot fetch device page"
+        )
         if resp.status != 200:
             raise BwtApiError(
                 f"Device page returned status {resp.status}"
             )
 
         page_bytes = await resp.read()
-        soup = BeautifulSoup(page_bytes, "html.parser")
+        soup = _parse_html(page_bytes)
+        if self.parse_observer:
+            self.parse_observer("device page")
         live_div = soup.find("div", {"data-controller": "live"})
 
         if not live_div:
@@ -192,30 +283,26 @@ class BwtCloudApi:
             "args": {},
         }
 
-        try:
-            resp = await self._session.post(
-                BWT_LOAD_CONSO_URL,
-                data={"data": json.dumps(payload_data)},
-                headers={
-                    "Accept": "application/vnd.live-component+html",
-                    "Content-Type": "application/x-www-form-urlencoded",
-                },
-                allow_redirects=True,
-                timeout=CONNECT_TIMEOUT,
-            )
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise BwtConnectionError(f"Cannot fetch consumption data: {err}") from err
-
-        if resp.status in (401, 403):
-            self._authenticated = False
-            raise BwtAuthError("Session expired")
+        resp = await self._request(
+            "POST",
+            BWT_LOAD_CONSO_URL,
+            "Cannot fetch consumption data",
+            data={"data": json.dumps(payload_data)},
+            headers={
+                "Accept": "application/vnd.live-component+html",
+                "Content-Type": "application/x-www-form-urlencoded",
+            },
+            allow_redirects=True,
+        )
         if resp.status != 200:
             raise BwtApiError(
                 f"loadConso returned status {resp.status}"
             )
 
         conso_bytes = await resp.read()
-        soup = BeautifulSoup(conso_bytes, "html.parser")
+        soup = _parse_html(conso_bytes)
+        if self.parse_observer:
+            self.parse_observer("loadConso")
         graph_div = soup.find("div", id="graph_device")
 
         if not graph_div:
@@ -241,38 +328,35 @@ class BwtCloudApi:
         if refresh_date_str:
             result["refresh_date"] = _parse_datetime(refresh_date_str)
 
-        # Parse first line of data (most recent)
+        # Dated lines, most recent first
         lines = dataset_json.get("lines", [])
         _LOGGER.debug("Consumption dataset keys: %s, lines count: %d",
                        list(dataset_json.keys()), len(lines))
-        if lines:
-            first_line = lines[0]
-            if len(first_line) >= 5:
-                result["last_date"] = first_line[0]
-                result["regen_count"] = int(first_line[1]) if first_line[1] else 0
-                result["power_outage"] = (
-                    first_line[2] if isinstance(first_line[2], bool) else False
-                )
-                result["water_consumption"] = (
-                    int(first_line[3]) if first_line[3] else 0
-                )
-                result["salt_alarm"] = (
-                    first_line[4] if isinstance(first_line[4], bool) else False
-                )
-                result["salt_consumption"] = (
-                    result["regen_count"] * result["salt_per_regen"]
-                )
+        history = [_parse_line(line) for line in lines if len(line) >= 5]
+        result["history"] = history
+
+        if lines and len(lines[0]) >= 5:
+            (
+                result["last_date"],
+                result["regen_count"],
+                result["power_outage"],
+                result["water_consumption"],
+                result["salt_alarm"],
+            ) = history[0]
+            result["salt_consumption"] = (
+                result["regen_count"] * result["salt_per_regen"]
+            )
 
-                try:
-                    naive_dt = datetime.strptime(result["last_date"], "%Y-%m-%d")
-                    result["last_update"] = dt_util.as_utc(naive_dt)
-                except (ValueError, TypeError) as exc:
-                    _LOGGER.warning(
-                        "Failed to parse last_date '%s': %s",
-                        result.get("last_date"),
-                        exc,
-                    )
-                    result["last_update"] = None
+            try:
+                naive_dt = datetime.strptime(result["last_date"], "%Y-%m-%d")
+                result["last_update"] = _as_utc(naive_dt)
+            except (ValueError, TypeError) as exc:
+                _LOGGER.warning(
+                    "Failed to parse last_date '%s': %s",
+                    result.get("last_date"),
+                    exc,
+                )
+                result["last_update"] = None
 
         _LOGGER.debug("Consumption data retrieved: %s", result)
         return result
@@ -282,17 +366,47 @@ class BwtCloudApi:
         return self._authenticated
 
 
+def _parse_html(markup):
+    """Parse HTML markup, importing BeautifulSoup on first use.
+
+    bs4 is only needed once a fetch actually runs, so keep it off the
+    integration import path. Home Assistant pre-imports it in its import
+    executor before the first refresh, so this import is then a lookup.
+    """
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(markup, "html.parser")
+
+
+def _parse_line(line: list) -> tuple[str, int, bool, int, bool]:
+    """Normalise a loadConso line to (date, regen_count, power_outage,
+    water_consumption, salt_alarm)."""
+    return (
+        line[0],
+        int(line[1]) if line[1] else 0,
+        line[2] if isinstance(line[2], bool) else False,
+        int(line[3]) if line[3] else 0,
+        line[4] if isinstance(line[4], bool) else False,
+    )
+
+
+def _as_utc(naive_dt: datetime) -> datetime:
+    """Convert a naive local datetime to UTC.
+
+    Inside Home Assistant the configured time zone is used; as a plain
+    library the system time zone is.
+    """
+    if dt_util is not None:
+        return dt_util.as_utc(naive_dt)
+    return naive_dt.astimezone(timezone.utc)
+
+
 def _parse_datetime(date_str: str):
     """Parse a datetime string in various ISO-ish formats, return UTC-aware datetime."""
-    for fmt in (
-        "%Y-%m-%dT%H:%M:%S.%f",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%d",
-    ):
+    for fmt in _DATETIME_FORMATS:
         try:
             naive_dt = datetime.strptime(date_str, fmt)
-            return dt_util.as_utc(naive_dt)
+            return _as_utc(naive_dt)
         except ValueError:
             continue
     _LOGGER.warning("Failed to parse datetime '%s'", date_str)
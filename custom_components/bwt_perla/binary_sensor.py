@@ -1,5 +1,8 @@
 """Binary sensor platform for BWT Perla integration."""
-from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.components.binary_sensor import (
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -7,13 +10,22 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
-    MANUFACTURER,
     BINARY_SENSOR_TYPES,
-    CONF_SERIAL_NUMBER,
-    CONF_DEVICE_NAME,
-    DEFAULT_DEVICE_NAME,
 )
 from .coordinator import BWTDataUpdateCoordinator
+from .events import EVENT_FLAGS
+
+# Built once at import and shared by the entities of every device
+BINARY_SENSOR_DESCRIPTIONS = tuple(
+    BinarySensorEntityDescription(
+        key=sensor_type,
+        name=sensor_info["name"],
+        has_entity_name=True,
+        device_class=sensor_info.get("device_class"),
+        icon=sensor_info.get("icon"),
+    )
+    for sensor_type, sensor_info in BINARY_SENSOR_TYPES.items()
+)
 
 
 async def async_setup_entry(
@@ -25,8 +37,8 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][entry.entry_id]
 
     async_add_entities(
-        BWTBinarySensor(coordinator, entry, sensor_type)
-        for sensor_type in BINARY_SENSOR_TYPES
+        BWTBinarySensor(coordinator, description)
+        for description in BINARY_SENSOR_DESCRIPTIONS
     )
 
 
@@ -36,33 +48,27 @@ class BWTBinarySensor(CoordinatorEntity, BinarySensorEntity):
     def __init__(
         self,
         coordinator: BWTDataUpdateCoordinator,
-        entry: ConfigEntry,
-        sensor_type: str,
+        description: BinarySensorEntityDescription,
     ) -> None:
         super().__init__(coordinator)
-        self._sensor_type = sensor_type
-        self._serial_number = entry.data[CONF_SERIAL_NUMBER]
-        self._device_name = entry.data.get(CONF_DEVICE_NAME, DEFAULT_DEVICE_NAME)
-        self._attr_unique_id = f"{self._serial_number}_{sensor_type}"
-
-        sensor_info = BINARY_SENSOR_TYPES[sensor_type]
-        self._attr_name = f"{self._device_name} {sensor_info['name']}"
-        self._attr_device_class = sensor_info.get("device_class")
-        self._attr_icon = sensor_info.get("icon")
-
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, self._serial_number)},
-            "name": self._device_name,
-            "manufacturer": MANUFACTURER,
-            "model": "My Perla Optimum",
-        }
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.serial_number}_{description.key}"
+        self._attr_device_info = coordinator.device_info
 
     @property
     def is_on(self):
         """Return true if the binary sensor is on."""
         if self.coordinator.data is None:
             return None
-        return self.coordinator.data.get(self._sensor_type, False)
+        return self.coordinator.data.get(self.entity_description.key, False)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the date of the most recent flagged day, for event sensors."""
+        key = self.entity_description.key
+        if key not in EVENT_FLAGS or self.coordinator.data is None:
+            return None
+        return {"last_occurrence": self.coordinator.data.get(f"{key}_last_occurrence")}
 
     @property
     def available(self) -> bool:
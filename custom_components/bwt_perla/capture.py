@@ -0,0 +1,329 @@
+"""Record-and-replay capture of BWT cloud traffic.
+
+TrafficRecorder writes every request made by a BwtCloudApi (with capture
+enabled) to a size-capped ring of NDJSON segment files, with credentials
+and cookies redacted. ReplaySession serves those recordings back to a
+BwtCloudApi in place of an aiohttp.ClientSession, with their original
+timing, so production sequences can be reproduced offline:
+
+    python -m custom_components.bwt_perla.capture CAPTURE_DIR --serial J7FB-D9CK
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+import aiohttp
+from yarl import URL
+
+from .api import BwtCloudApi, BwtApiError
+from .const import (
+    BWT_LOGIN_URL,
+    BWT_DASHBOARD_URL,
+    BWT_SUMMARY_URL,
+    BWT_DEVICE_URL,
+    DEFAULT_CAPTURE_MAX_BYTES,
+    CAPTURE_SEGMENTS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+REDACTED = "**REDACTED**"
+
+_SEGMENT_RE = re.compile(r"^capture-(\d+)\.ndjson$")
+_REDACTED_FIELDS = {"_username", "_password"}
+_REDACTED_HEADERS = {"cookie", "set-cookie", "authorization"}
+
+
+class ReplayError(Exception):
+    """The client made a request that is not in the recording."""
+
+
+class TrafficRecorder:
+    """Record requests and responses to a ring of NDJSON files on disk."""
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = DEFAULT_CAPTURE_MAX_BYTES,
+        segments: int = CAPTURE_SEGMENTS,
+    ) -> None:
+        self._directory = directory
+        self._segments = max(segments, 2)
+        self._segment_bytes = max(max_bytes // self._segments, 1)
+        self._lock = threading.Lock()
+        # Resolved on first write, which runs in an executor thread
+        self._index: int | None = None
+        self._size = 0
+
+    async def async_record(
+        self,
+        method: str,
+        url: str,
+        request_kwargs: dict,
+        started: float,
+        secrets: tuple[str, ...],
+        resp=None,
+        body: bytes | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        """Record one exchange; `started` is its time.monotonic() start."""
+        elapsed = time.monotonic() - started
+        record = {
+            "ts": round(time.time() - elapsed, 4),
+            "elapsed": round(elapsed, 4),
+            "method": method,
+            "url": url,
+            "data": _redact_fields(request_kwargs.get("data"), secrets),
+            "request_headers": _redact_headers(request_kwargs.get("headers")),
+        }
+        if error is not None:
+            record["error"] = "timeout" if isinstance(error, TimeoutError) else "client"
+            record["message"] = str(error)
+        else:
+            record["status"] = resp.status
+            record["response_url"] = str(resp.url)
+            record["response_headers"] = _redact_headers(resp.headers)
+            record["body"] = _redact_text(body.decode("utf-8", "replace"), secrets)
+
+        line = json.dumps(record) + "\n"
+        await asyncio.get_running_loop().run_in_executor(None, self._write, line)
+
+    def _write(self, line: str) -> None:
+        with self._lock:
+            if self._index is None:
+                os.makedirs(self._directory, exist_ok=True)
+                indexes = _segment_indexes(self._directory)
+                self._index = indexes[-1] if indexes else 0
+                path = self._path(self._index)
+                self._size = os.path.getsize(path) if os.path.exists(path) else 0
+
+            size = len(line.encode("utf-8"))
+            if self._size and self._size + size > self._segment_bytes:
+                self._index += 1
+                self._size = 0
+                indexes = _segment_indexes(self._directory)
+                for index in indexes[: max(len(indexes) - self._segments + 1, 0)]:
+                    os.remove(self._path(index))
+
+            with open(self._path(self._index), "a", encoding="utf-8") as segment:
+                segment.write(line)
+            self._size += size
+
+    def _path(self, index: int) -> str:
+        return os.path.join(self._directory, f"capture-{index:06d}.ndjson")
+
+
+def load_recordings(directory: str) -> list[dict]:
+    """Load every recorded exchange in `directory`, oldest first."""
+    records = []
+    for index in _segment_indexes(directory):
+        path = os.path.join(directory, f"capture-{index:06d}.ndjson")
+        with open(path, encoding="utf-8") as segment:
+            records.extend(json.loads(line) for line in segment if line.strip())
+    records.sort(key=lambda record: record["ts"])
+    return records
+
+
+class ReplayResponse:
+    """The subset of aiohttp.ClientResponse that BwtCloudApi uses."""
+
+    def __init__(self, record: dict) -> None:
+        self.status = record["status"]
+        self.url = URL(record.get("response_url") or record["url"])
+        self.headers = record.get("response_headers") or {}
+        self._body = record.get("body", "").encode("utf-8")
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        return self._body.decode(encoding)
+
+    async def json(self, **_kwargs):
+        return json.loads(self._body)
+
+    def release(self) -> None:
+        """Nothing to release; present for aiohttp compatibility."""
+
+
+class ReplaySession:
+    """Serve recorded exchanges in place of an aiohttp.ClientSession.
+
+    Each request is answered with the next unused recording for the same
+    method and URL. Responses are delayed to match the recorded gaps
+    between requests and the recorded response times, scaled by `speed`
+    (0 replays without any delay).
+    """
+
+    def __init__(self, recordings: list[dict], speed: float = 1.0) -> None:
+        self._recordings = recordings
+        self._used = [False] * len(recordings)
+        self._cursor = 0
+        self._speed = speed
+        self._origin: tuple[float, float] | None = None
+
+    @property
+    def remaining(self) -> int:
+        return self._used.count(False)
+
+    def peek(self) -> dict | None:
+        """Return the next unused recording without consuming it."""
+        self._advance()
+        if self._cursor < len(self._recordings):
+            return self._recordings[self._cursor]
+        return None
+
+    def skip(self) -> None:
+        """Consume the next unused recording without replaying it."""
+        if self.peek() is not None:
+            self._used[self._cursor] = True
+
+    async def request(self, method: str, url, **_kwargs) -> ReplayResponse:
+        record = self._take(method, str(url))
+
+        if self._speed:
+            loop = asyncio.get_running_loop()
+            if self._origin is None:
+                self._origin = (loop.time(), record["ts"])
+            due = self._origin[0] + (record["ts"] - self._origin[1]) / self._speed
+            await asyncio.sleep(
+                max(due - loop.time(), 0) + record["elapsed"] / self._speed
+            )
+
+        if record.get("error") == "timeout":
+            raise TimeoutError(record.get("message", "Recorded timeout"))
+        if record.get("error"):
+            raise aiohttp.ClientConnectionError(record.get("message", ""))
+        return ReplayResponse(record)
+
+    async def get(self, url, **kwargs) -> ReplayResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs) -> ReplayResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self) -> None:
+        """Nothing to close; present for aiohttp compatibility."""
+
+    def _advance(self) -> None:
+        while self._cursor < len(self._used) and self._used[self._cursor]:
+            self._cursor += 1
+
+    def _take(self, method: str, url: str) -> dict:
+        self._advance()
+        for index in range(self._cursor, len(self._recordings)):
+            record = self._recordings[index]
+            if (
+                not self._used[index]
+                and record["method"] == method
+                and record["url"] == url
+            ):
+                self._used[index] = True
+                return record
+        raise ReplayError(f"No recorded response left for {method} {url}")
+
+
+def _segment_indexes(directory: str) -> list[int]:
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        int(match.group(1))
+        for name in os.listdir(directory)
+        if (match := _SEGMENT_RE.match(name))
+    )
+
+
+def _redact_text(text: str, secrets: tuple[str, ...]) -> str:
+    for secret in secrets:
+        if secret:
+            text = text.replace(secret, REDACTED)
+    return text
+
+
+def _redact_fields(data, secrets: tuple[str, ...]):
+    if not isinstance(data, dict):
+        return data
+    return {
+        key: REDACTED
+        if key in _REDACTED_FIELDS or value in secrets
+        else _redact_text(str(value), secrets)
+        for key, value in data.items()
+    }
+
+
+def _redact_headers(headers) -> dict:
+    if not headers:
+        return {}
+    return {
+        key: REDACTED if key.lower() in _REDACTED_HEADERS else value
+        for key, value in headers.items()
+    }
+
+
+async def _replay(directory: str, serial: str | None, speed: float) -> None:
+    """Drive a BwtCloudApi through a recording, one NDJSON line per call."""
+    session = ReplaySession(load_recordings(directory), speed=speed)
+    api = BwtCloudApi(session, REDACTED, REDACTED, serial)
+    loop = asyncio.get_running_loop()
+
+    while (record := session.peek()) is not None:
+        url = record["url"]
+        if url == BWT_LOGIN_URL:
+            call, coro = "login", api.login()
+        elif url == BWT_DASHBOARD_URL and serial:
+            call, coro = "find_receipt_line_keys", api.find_receipt_line_keys([serial])
+        elif url.startswith(f"{BWT_SUMMARY_URL}/"):
+            key = url.rsplit("/", 1)[1]
+            call, coro = "get_main_data", api.get_main_data(key)
+        elif url.startswith(f"{BWT_DEVICE_URL}?receiptLineKey="):
+            key = url.split("receiptLineKey=", 1)[1]
+            call, coro = "get_consumption_data", api.get_consumption_data(key)
+        else:
+            session.skip()
+            continue
+
+        start = loop.time()
+        line = {"call": call, "recorded_ts": record["ts"]}
+        try:
+            line["result"] = await coro
+        except (BwtApiError, ReplayError) as err:
+            line["error"] = f"{type(err).__name__}: {err}"
+        line["elapsed"] = round(loop.time() - start, 4)
+        sys.stdout.write(json.dumps(line, default=str) + "\n")
+
+        if "error" in line and session.peek() is record:
+            # The call failed before consuming its own recording
+            session.skip()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Replay captured BWT cloud traffic through BwtCloudApi."
+    )
+    parser.add_argument("directory", help="capture directory to replay")
+    parser.add_argument(
+        "--serial", help="device serial number, to replay dashboard lookups"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="timing scale, 0 to replay without delays (default: %(default)s)",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING, stream=sys.stderr
+    )
+    asyncio.run(_replay(args.directory, args.serial, args.speed))
+
+
+if __name__ == "__main__":
+    main()
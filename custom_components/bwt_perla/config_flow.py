@@ -14,6 +14,7 @@ from .const import (
     CONF_DEVICE_NAME,
     CONF_INTERVAL_MAIN,
     CONF_INTERVAL_CONSUMPTION,
+    CONF_CAPTURE,
     DEFAULT_DEVICE_NAME,
     DEFAULT_INTERVAL_MAIN,
     DEFAULT_INTERVAL_CONSUMPTION,
@@ -138,6 +139,10 @@ class BWTOptionsFlow(config_entries.OptionsFlow):
                             ),
                         ),
                     ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
+                    vol.Optional(
+                        CONF_CAPTURE,
+                        default=self.config_entry.options.get(CONF_CAPTURE, False),
+                    ): bool,
                 }
             ),
         )
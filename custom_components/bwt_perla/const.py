@@ -9,16 +9,43 @@ CONF_SERIAL_NUMBER = "serial_number"
 CONF_DEVICE_NAME = "device_name"
 CONF_INTERVAL_MAIN = "interval_main"
 CONF_INTERVAL_CONSUMPTION = "interval_consumption"
+CONF_CAPTURE = "capture"
 
 # Defaults
 DEFAULT_DEVICE_NAME = "BWT My Perla Optimum"
 DEFAULT_INTERVAL_MAIN = 3600  # 1 hour
 DEFAULT_INTERVAL_CONSUMPTION = 60  # 1 minute
 
+# Scheduling shared by all entries (see scheduler.py)
+DATA_SCHEDULER = "scheduler"
+MAX_CONCURRENT_FETCHES = 4
+
+# Persistent storage, one file per config entry
+STORAGE_KEY = f"{DOMAIN}.{{entry_id}}"
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
+
 # Update intervals
 UPDATE_INTERVAL_MAIN = timedelta(seconds=3600)
 UPDATE_INTERVAL_CONSUMPTION = timedelta(seconds=300)
 
+# Events
+EVENT_BWT_PERLA = "bwt_perla_event"
+
+# Services
+SERVICE_PROFILE = "profile"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_CYCLES = "cycles"
+ATTR_TOP = "top"
+DEFAULT_PROFILE_CYCLES = 1
+DEFAULT_PROFILE_TOP = 30
+PROFILE_DIR = "bwt_perla_profiles"
+
+# Traffic capture
+CAPTURE_DIR = "bwt_perla_capture"
+CAPTURE_SEGMENTS = 4
+DEFAULT_CAPTURE_MAX_BYTES = 10 * 1024 * 1024
+
 # API URLs
 BWT_BASE_URL = "https://www.bwt-monservice.com"
 BWT_LOGIN_URL = f"{BWT_BASE_URL}/login"
@@ -122,6 +149,66 @@ SENSOR_TYPES = {
     },
 }
 
+# Calendar-period totals computed from the dated loadConso lines (see
+# history.py). Keys are "<quantity>_<period>".
+PERIOD_NAMES = {
+    "day": "Today",
+    "week": "This Week",
+    "month": "This Month",
+    "year": "This Year",
+}
+PERIOD_QUANTITIES = {
+    "water": {
+        "name": "Water",
+        "unit": "L",
+        "icon": "mdi:water",
+        "device_class": "water",
+    },
+    "regen": {
+        "name": "Regenerations",
+        "unit": "",
+        "icon": "mdi:refresh",
+        "device_class": None,
+    },
+    "salt": {
+        "name": "Salt",
+        "unit": "g",
+        "icon": "mdi:shaker-outline",
+        "device_class": "weight",
+    },
+}
+for _quantity, _info in PERIOD_QUANTITIES.items():
+    for _period, _period_name in PERIOD_NAMES.items():
+        SENSOR_TYPES[f"{_quantity}_{_period}"] = {
+            **_info,
+            "name": f"{_info['name']} {_period_name}",
+            "state_class": "total",
+            "period": _period,
+        }
+
+# Publish policies for jittery sensors. A new value is written only once
+# it moves by more than "deadband" (absolute) or "relative_deadband" (share
+# of the published value) from the last published value, and at most every
+# "min_interval" seconds. A value held for "min_interval" seconds without
+# changing is published even if suppressed, so the settled value is stored.
+SENSOR_PUBLISH_POLICIES = {
+    "wifi_signal": {
+        "deadband": 3,
+        "relative_deadband": 0,
+        "min_interval": 900,
+    },
+    "pressure": {
+        "deadband": 0,
+        "relative_deadband": 0.05,
+        "min_interval": 900,
+    },
+    "water_increment": {
+        "deadband": 1,
+        "relative_deadband": 0,
+        "min_interval": 300,
+    },
+}
+
 BINARY_SENSOR_TYPES = {
     "online": {
         "name": "Online",
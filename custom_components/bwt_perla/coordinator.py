@@ -4,19 +4,34 @@ from datetime import timedelta
 
 import aiohttp
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.const import CONF_USERNAME, CONF_PASSWORD
+from homeassistant.util import dt as dt_util
 
 from .api import BwtCloudApi, BwtAuthError, BwtConnectionError, BwtApiError
+from .events import EventTracker
+from .history import ConsumptionHistory
 from .const import (
     DOMAIN,
+    MANUFACTURER,
     CONF_SERIAL_NUMBER,
+    CONF_DEVICE_NAME,
+    DEFAULT_DEVICE_NAME,
+    EVENT_BWT_PERLA,
     CONF_INTERVAL_MAIN,
     CONF_INTERVAL_CONSUMPTION,
+    CONF_CAPTURE,
+    CAPTURE_DIR,
     DEFAULT_INTERVAL_MAIN,
     DEFAULT_INTERVAL_CONSUMPTION,
+    PROFILE_DIR,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    STORAGE_SAVE_DELAY,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -25,11 +40,30 @@ _LOGGER = logging.getLogger(__name__)
 class BWTDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching BWT data."""
 
-    def __init__(self, hass: HomeAssistant, entry) -> None:
+    def __init__(self, hass: HomeAssistant, entry, scheduler) -> None:
         self.entry = entry
+        self._scheduler = scheduler
         self.receipt_line_key: str | None = None
         self._last_main_update: float = 0
         self._last_water_consumption: int = 0
+        self._profiler = None
+
+        # Shared by all entities of this device
+        self.serial_number = entry.data[CONF_SERIAL_NUMBER]
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.serial_number)},
+            name=entry.data.get(CONF_DEVICE_NAME, DEFAULT_DEVICE_NAME),
+            manufacturer=MANUFACTURER,
+            model="My Perla Optimum",
+        )
+
+        # Per-day consumption history behind the calendar-period totals and
+        # the event watermark, loaded from storage on the first update
+        self._store = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id)
+        )
+        self._history: ConsumptionHistory | None = None
+        self._events: EventTracker | None = None
 
         # Use a dedicated session with cookie jar so login cookies persist
         # unsafe=True allows cookies for IP-based and non-standard domains
@@ -40,12 +74,14 @@ class BWTDataUpdateCoordinator(DataUpdateCoordinator):
             session=self._session,
             username=entry.data[CONF_USERNAME],
             password=entry.data[CONF_PASSWORD],
-            serial_number=entry.data[CONF_SERIAL_NUMBER],
+            serial_number=self.serial_number,
         )
 
-        interval = entry.options.get(
-            CONF_INTERVAL_CONSUMPTION,
-            entry.data.get(CONF_INTERVAL_CONSUMPTION, DEFAULT_INTERVAL_CONSUMPTION),
+        self._interval_main = self._get_option(
+            CONF_INTERVAL_MAIN, DEFAULT_INTERVAL_MAIN
+        )
+        interval = self._get_option(
+            CONF_INTERVAL_CONSUMPTION, DEFAULT_INTERVAL_CONSUMPTION
         )
 
         super().__init__(
@@ -54,10 +90,135 @@ class BWTDataUpdateCoordinator(DataUpdateCoordinator):
             name=DOMAIN,
             update_interval=timedelta(seconds=interval),
         )
+        self._apply_capture()
+
+    def _get_option(self, key: str, default):
+        """Return an option, falling back to the initial config data."""
+        return self.entry.options.get(key, self.entry.data.get(key, default))
+
+    @callback
+    def async_apply_options(self) -> None:
+        """Apply changed update intervals to the running schedule.
+
+        The session and receipt_line_key are kept, so no login or dashboard
+        scrape is needed, unlike reloading the entry.
+        """
+        self._apply_capture()
+        self._interval_main = self._get_option(
+            CONF_INTERVAL_MAIN, DEFAULT_INTERVAL_MAIN
+        )
+        interval = timedelta(
+            seconds=self._get_option(
+                CONF_INTERVAL_CONSUMPTION, DEFAULT_INTERVAL_CONSUMPTION
+            )
+        )
+        if interval != self.update_interval:
+            _LOGGER.debug("Consumption update interval changed to %s", interval)
+            self.update_interval = interval
+            self._schedule_refresh()
+
+    def _apply_capture(self) -> None:
+        """Start or stop recording cloud traffic as the options ask."""
+        if not self.entry.options.get(CONF_CAPTURE, False):
+            self.api.capture = None
+        elif self.api.capture is None:
+            from .capture import TrafficRecorder
+
+            self.api.capture = TrafficRecorder(
+                self.hass.config.path(CAPTURE_DIR, self.entry.entry_id)
+            )
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next refresh on this entry's phase of the poll grid.
+
+        Replaces the base class timing (interval after the last refresh),
+        which lines all entries up after a boot, with the slots handed out
+        by the domain-wide BWTPollScheduler.
+        """
+        if self.update_interval is None or self.entry.pref_disable_polling:
+            return
+
+        self._async_unsub_refresh()
+        loop = self.hass.loop
+        next_refresh = self._scheduler.next_refresh(
+            self.entry.entry_id, loop.time(), self.update_interval.total_seconds()
+        )
+        self._unsub_refresh = loop.call_at(
+            next_refresh, self._handle_scheduled_refresh
+        ).cancel
+
+    @callback
+    def _handle_scheduled_refresh(self) -> None:
+        """Start the scheduled refresh as the base class does.
+
+        A background task, so polls do not hold up startup or
+        async_block_till_done.
+        """
+        self.entry.async_create_background_task(
+            self.hass,
+            self._handle_refresh_interval(),
+            name=f"{self.name} - {self.entry.title} - refresh",
+            eager_start=True,
+        )
+
+    def start_profiling(self, cycles: int, top: int) -> None:
+        """Profile the next `cycles` update cycles (see the profile service)."""
+        from .profiler import UpdateProfiler
+
+        if self._profiler is None:
+            self._profiler = UpdateProfiler(
+                self.hass,
+                self.hass.config.path(PROFILE_DIR),
+                f"{DOMAIN}_{self.entry.entry_id}",
+            )
+        self._profiler.arm(cycles, top)
 
     async def _async_update_data(self) -> dict:
+        """Fetch data from BWT, profiling the cycle when requested."""
+        # Cap how many entries fetch at once across the whole domain
+        async with self._scheduler.fetch_slot:
+            if self._profiler is not None and self._profiler.active:
+                return await self._profiler.async_profile(
+                    self.api, self._async_fetch_data
+                )
+            return await self._async_fetch_data()
+
+    async def _async_load_store(self) -> None:
+        stored = await self._store.async_load() or {}
+        self._history = ConsumptionHistory(stored.get("days"))
+        self._events = EventTracker(stored.get("events"))
+
+    @callback
+    def _data_to_store(self) -> dict:
+        return {"days": self._history.days, "events": self._events.as_dict()}
+
+    def _fire_events(self, history: list) -> bool:
+        """Fire an event per flagged day since the last poll.
+
+        Returns True if the tracker state changed and must be saved.
+        """
+        watermark = self._events.as_dict()
+        for event_type, day in self._events.scan(history):
+            _LOGGER.debug("BWT %s on %s", event_type, day)
+            self.hass.bus.async_fire(
+                EVENT_BWT_PERLA,
+                {
+                    "config_entry_id": self.entry.entry_id,
+                    "serial_number": self.serial_number,
+                    "type": event_type,
+                    "date": day,
+                },
+            )
+        return self._events.as_dict() != watermark
+
+    async def _async_fetch_data(self) -> dict:
         """Fetch data from BWT."""
+        today = dt_util.now().date()
         try:
+            if self._history is None:
+                await self._async_load_store()
+
             # Authenticate if needed
             if not self.receipt_line_key:
                 self.receipt_line_key = await self.api.authenticate()
@@ -65,12 +226,7 @@ class BWTDataUpdateCoordinator(DataUpdateCoordinator):
             data = dict(self.data) if self.data else {}
 
             # Main data (less frequent)
-            interval_main = self.entry.options.get(
-                CONF_INTERVAL_MAIN,
-                self.entry.data.get(CONF_INTERVAL_MAIN, DEFAULT_INTERVAL_MAIN),
-            )
-
-            if (self.hass.loop.time() - self._last_main_update) > interval_main:
+            if (self.hass.loop.time() - self._last_main_update) > self._interval_main:
                 try:
                     main_data = await self.api.get_main_data(self.receipt_line_key)
                     data.update(main_data)
@@ -87,7 +243,15 @@ class BWTDataUpdateCoordinator(DataUpdateCoordinator):
                 consumption_data = await self.api.get_consumption_data(
                     self.receipt_line_key
                 )
+                history = consumption_data.pop("history", [])
                 data.update(consumption_data)
+                changed = self._history.ingest(
+                    history, consumption_data.get("salt_per_regen", 0), today
+                )
+                if self._fire_events(history) or changed:
+                    self._store.async_delay_save(
+                        self._data_to_store, STORAGE_SAVE_DELAY
+                    )
                 _LOGGER.debug("Consumption data updated")
             except BwtAuthError:
                 self.receipt_line_key = None
@@ -112,6 +276,12 @@ class BWTDataUpdateCoordinator(DataUpdateCoordinator):
             if not data or len(data) < 3:
                 raise UpdateFailed("Insufficient data received")
 
+            # Calendar-period totals; recomputed every cycle so they reset
+            # when a new day, week, month or year starts
+            data.update(self._history.totals(today))
+            for event_type, day in self._events.last_occurrence.items():
+                data[f"{event_type}_last_occurrence"] = day
+
             return data
 
         except (BwtAuthError, BwtConnectionError) as err:
@@ -124,6 +294,13 @@ class BWTDataUpdateCoordinator(DataUpdateCoordinator):
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
     async def async_shutdown(self) -> None:
-        """Close the API session."""
+        """Save pending history and events, then close the API session.
+
+        Saving now also cancels the delayed save, which would otherwise
+        write the file back after async_remove_entry deleted it, or leave a
+        reloaded entry to start from a stale event watermark.
+        """
+        if self._history is not None:
+            await self._store.async_save(self._data_to_store())
         await self._session.close()
         await super().async_shutdown()
@@ -0,0 +1,84 @@
+"""Salt-alarm and power-outage event detection from dated loadConso lines."""
+
+# Event type -> index of its flag in a parsed loadConso line
+# (date, regen_count, power_outage, water_consumption, salt_alarm)
+EVENT_FLAGS = {
+    "power_outage": 2,
+    "salt_alarm": 4,
+}
+
+
+class EventTracker:
+    """Find flagged days that appeared since the last scan.
+
+    A persisted watermark holds the newest day already scanned. Lines come
+    newest first, so each scan stops at the watermark and costs only the new
+    rows, however often it runs. The watermark day itself is rescanned,
+    because the cloud may flag it later in the day; `fired` remembers which
+    of its events were already reported.
+    """
+
+    def __init__(self, stored: dict | None = None) -> None:
+        stored = stored or {}
+        self._watermark: str | None = stored.get("watermark")
+        self._fired: set[str] = set(stored.get("fired", ()))
+        self.last_occurrence: dict[str, str | None] = {
+            event_type: stored.get("last_occurrence", {}).get(event_type)
+            for event_type in EVENT_FLAGS
+        }
+
+    def as_dict(self) -> dict:
+        """Return a snapshot of the tracker state, for persisting."""
+        return {
+            "watermark": self._watermark,
+            "fired": sorted(self._fired),
+            "last_occurrence": dict(self.last_occurrence),
+        }
+
+    def scan(self, lines) -> list[tuple[str, str]]:
+        """Return new (event_type, date) events, oldest first.
+
+        On the very first scan there is no watermark: the most recent
+        occurrences are recorded but no events are returned, so installing
+        the integration does not replay the whole cloud history.
+        """
+        if not lines:
+            return []
+
+        seeding = self._watermark is None
+        events: list[tuple[str, str]] = []
+        for line in lines:
+            day = line[0]
+            if not isinstance(day, str):
+                continue
+            if not seeding and day < self._watermark:
+                break
+            for event_type, index in EVENT_FLAGS.items():
+                if not line[index]:
+                    continue
+                if day == self._watermark and event_type in self._fired:
+                    continue
+                events.append((event_type, day))
+
+        # Lines are newest first
+        newest = next(
+            (line[0] for line in lines if isinstance(line[0], str)), None
+        )
+        if newest is not None and (
+            self._watermark is None or newest > self._watermark
+        ):
+            self._watermark = newest
+            self._fired = set()
+        self._fired.update(
+            event_type for event_type, day in events if day == self._watermark
+        )
+
+        for event_type, day in events:
+            last = self.last_occurrence[event_type]
+            if last is None or day > last:
+                self.last_occurrence[event_type] = day
+
+        if seeding:
+            return []
+        events.reverse()
+        return events
@@ -0,0 +1,298 @@
+"""Standalone fleet poller for BWT Mon Service accounts.
+
+Polls every device of every configured account on a single event loop and
+streams one NDJSON record per device poll to stdout:
+
+    python -m custom_components.bwt_perla.fleet accounts.json \\
+        --concurrency 20 --rate 10 --interval 300
+
+The accounts file is a JSON list of objects with ``username``, ``password``
+and ``devices`` (a list of serial numbers). Only aiohttp and beautifulsoup4
+are required; Home Assistant is not.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+
+import aiohttp
+
+from .api import BwtCloudApi, BwtApiError, BwtAuthError
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 20
+DEFAULT_RATE = 10.0
+
+
+class RateLimiter:
+    """Space out request starts to at most `rate` per second."""
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    async def acquire(self) -> None:
+        if not self._interval:
+            return
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next)
+        # Reserve the slot before sleeping so concurrent callers queue up.
+        self._next = start + self._interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class RequestGate:
+    """Admit HTTP requests under a concurrency cap and a start rate.
+
+    Passed to BwtCloudApi as its limiter, so every request counts, including
+    each page of a consumption fetch and transparent re-logins.
+    """
+
+    def __init__(self, concurrency: int, rate: float) -> None:
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._limiter = RateLimiter(rate)
+
+    async def __aenter__(self) -> None:
+        await self._semaphore.acquire()
+        try:
+            await self._limiter.acquire()
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._semaphore.release()
+
+
+class FleetPoller:
+    """Poll many accounts and devices under shared concurrency and rate limits."""
+
+    def __init__(
+        self,
+        accounts: list[dict],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate: float = DEFAULT_RATE,
+        interval: float = 0,
+        out=None,
+        capture_dir: str | None = None,
+    ) -> None:
+        self._accounts = accounts
+        self._concurrency = concurrency
+        self._gate = RequestGate(concurrency, rate)
+        self._interval = interval
+        self._out = out or sys.stdout
+        self._capture_dir = capture_dir
+
+    async def run(self) -> None:
+        """Poll all accounts once, or forever when an interval is set."""
+        connector = aiohttp.TCPConnector(limit=self._concurrency)
+        try:
+            results = await asyncio.gather(
+                *(
+                    self._poll_account(connector, index, account)
+                    for index, account in enumerate(self._accounts)
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            await connector.close()
+
+        # One account failing must not stop the others; report it instead
+        for account, result in zip(self._accounts, results):
+            if isinstance(result, Exception):
+                _LOGGER.error("Polling account failed", exc_info=result)
+                for serial in _account_devices(account):
+                    self._emit(
+                        account.get("username"), serial, error=_describe(result)
+                    )
+
+    async def _poll_account(
+        self, connector: aiohttp.TCPConnector, index: int, account: dict
+    ) -> None:
+        serials = _account_devices(account)
+        missing = [
+            field for field in ("username", "password") if not account.get(field)
+        ]
+        if missing:
+            error = f"account {index} is missing {' and '.join(missing)}"
+            for serial in serials or [None]:
+                self._emit(account.get("username"), serial, error=error)
+            return
+        username = account["username"]
+
+        # One session (and cookie jar) per account, sharing the connection pool
+        session = aiohttp.ClientSession(
+            connector=connector,
+            connector_owner=False,
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+        )
+        capture = None
+        if self._capture_dir:
+            from .capture import TrafficRecorder
+
+            # Named by position so the capture path does not leak the username
+            capture = TrafficRecorder(
+                os.path.join(self._capture_dir, f"account-{index}")
+            )
+        api = BwtCloudApi(
+            session,
+            username,
+            account["password"],
+            capture=capture,
+            limiter=self._gate,
+        )
+        keys: dict[str, str] = {}
+
+        try:
+            while True:
+                if not keys:
+                    try:
+                        await api.login()
+                        keys = await api.find_receipt_line_keys(serials)
+                    except Exception as err:
+                        for serial in serials:
+                            self._emit(username, serial, error=_describe(err))
+                    else:
+                        for serial in serials:
+                            if serial not in keys:
+                                self._emit(
+                                    username, serial, error="not found in dashboard"
+                                )
+
+                results = await asyncio.gather(
+                    *(
+                        self._poll_device(api, username, serial, key)
+                        for serial, key in keys.items()
+                    ),
+                    return_exceptions=True,
+                )
+                if any(result is not True for result in results):
+                    # Session expired: log in again on the next round
+                    keys = {}
+
+                if not self._interval:
+                    return
+                await asyncio.sleep(self._interval)
+        finally:
+            await session.close()
+
+    async def _poll_device(
+        self, api: BwtCloudApi, username: str, serial: str, key: str
+    ) -> bool:
+        """Poll one device; return False when the session needs renewing."""
+        try:
+            data = await api.get_main_data(key)
+            consumption = await api.get_consumption_data(key)
+            # The dated history repeats on every poll; keep records small
+            consumption.pop("history", None)
+            data.update(consumption)
+        except BwtAuthError as err:
+            self._emit(username, serial, error=str(err))
+            return False
+        except Exception as err:
+            _LOGGER.debug("Polling %s failed", serial, exc_info=True)
+            self._emit(username, serial, error=_describe(err))
+            return True
+
+        self._emit(username, serial, data=data)
+        return True
+
+    def _emit(self, username: str | None, serial: str | None, **fields) -> None:
+        record = {
+            "time": datetime.now(timezone.utc).isoformat(),
+            "account": username,
+            "serial": serial,
+            **fields,
+        }
+        self._out.write(json.dumps(record, default=_json_default) + "\n")
+        self._out.flush()
+
+
+def _account_devices(account: dict) -> list[str]:
+    return list(account.get("devices", []))
+
+
+def _describe(err: Exception) -> str:
+    """Return an error record message; unexpected errors keep their type."""
+    if isinstance(err, BwtApiError):
+        return str(err)
+    return f"{type(err).__name__}: {err}"
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Poll BWT devices for many accounts and stream NDJSON."
+    )
+    parser.add_argument("accounts", help="JSON file listing accounts and devices")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="maximum number of HTTP requests in flight (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help="maximum HTTP requests started per second, re-logins included, "
+        "0 for no limit "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0,
+        help="seconds between polls of an account, 0 to poll once "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--capture",
+        metavar="DIR",
+        help="record each account's traffic under DIR/account-<n> for replay",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.rate < 0:
+        parser.error("--rate must not be negative")
+    if args.interval < 0:
+        parser.error("--interval must not be negative")
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING, stream=sys.stderr
+    )
+
+    with open(args.accounts, encoding="utf-8") as accounts_file:
+        accounts = json.load(accounts_file)
+    if not isinstance(accounts, list) or not all(
+        isinstance(account, dict) for account in accounts
+    ):
+        parser.error(f"{args.accounts} must contain a JSON list of account objects")
+
+    poller = FleetPoller(
+        accounts,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        interval=args.interval,
+        capture_dir=args.capture,
+    )
+    try:
+        asyncio.run(poller.run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Calendar-period consumption totals built from dated loadConso lines."""
+from datetime import date, timedelta
+
+PERIODS = ("day", "week", "month", "year")
+QUANTITIES = ("water", "regen", "salt")
+
+# Days older than this are dropped; it covers the current and previous year
+RETENTION_DAYS = 400
+
+
+def period_keys(day: date) -> tuple[str, str, str, str]:
+    """Return the day, ISO week, month and year keys that contain `day`."""
+    iso_year, iso_week, _ = day.isocalendar()
+    return (
+        day.isoformat(),
+        f"{iso_year}-W{iso_week:02d}",
+        f"{day.year}-{day.month:02d}",
+        str(day.year),
+    )
+
+
+def period_start(period: str, day: date) -> date:
+    """Return the first day of the `period` that contains `day`."""
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    if period == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+
+class ConsumptionHistory:
+    """Running water, regeneration and salt totals per calendar period.
+
+    Totals are kept incrementally: a new day adds its values to the four
+    periods containing it, and a corrected day adds only the difference.
+    Polling more or less often therefore does not change the totals, which
+    depend only on the dated lines reported by the cloud.
+    """
+
+    def __init__(self, days: dict[str, list[int]] | None = None) -> None:
+        # date -> [water, regen, salt]
+        self._days: dict[str, list[int]] = {}
+        # period key -> [water, regen, salt]
+        self._totals: dict[str, list[int]] = {}
+        self._cutoff: str | None = None
+        for day, values in (days or {}).items():
+            self._apply(day, values)
+
+    @property
+    def days(self) -> dict[str, list[int]]:
+        """Per-day values, for persisting."""
+        return self._days
+
+    def ingest(self, lines, salt_per_regen: int, today: date) -> bool:
+        """Fold parsed loadConso lines in; return True if anything changed.
+
+        `lines` are (date, regen_count, power_outage, water, salt_alarm)
+        tuples as returned by BwtCloudApi.get_consumption_data.
+        """
+        cutoff = (today - timedelta(days=RETENTION_DAYS)).isoformat()
+        changed = False
+
+        for day, regen, _outage, water, _alarm in lines:
+            if not isinstance(day, str) or day < cutoff:
+                continue
+            old = self._days.get(day)
+            if old is not None and old[0] == water and old[1] == regen:
+                continue
+            # Salt is priced at ingest time so a later change of the salt
+            # dose does not rewrite past days.
+            if not self._apply(day, [water, regen, regen * salt_per_regen]):
+                continue
+            changed = True
+
+        if cutoff != self._cutoff:
+            # At most once a day
+            self._cutoff = cutoff
+            if self._days and min(self._days) < cutoff:
+                self._prune(cutoff)
+                changed = True
+        return changed
+
+    def totals(self, today: date) -> dict[str, int]:
+        """Return `<quantity>_<period>` totals for the periods containing today."""
+        result = {}
+        for period, key in zip(PERIODS, period_keys(today)):
+            values = self._totals.get(key, (0, 0, 0))
+            for quantity, value in zip(QUANTITIES, values):
+                result[f"{quantity}_{period}"] = value
+        return result
+
+    def _apply(self, day: str, values: list[int]) -> bool:
+        """Set one day's values and shift its period totals by the delta."""
+        try:
+            keys = period_keys(date.fromisoformat(day))
+        except ValueError:
+            return False
+
+        old = self._days.get(day, (0, 0, 0))
+        delta = [new - prev for new, prev in zip(values, old)]
+        for key in keys:
+            totals = self._totals.setdefault(key, [0, 0, 0])
+            for index, value in enumerate(delta):
+                totals[index] += value
+        self._days[day] = list(values)
+        return True
+
+    def _prune(self, cutoff: str) -> None:
+        """Forget days before `cutoff` and periods no kept day belongs to."""
+        self._days = {day: v for day, v in self._days.items() if day >= cutoff}
+        kept = {
+            key for day in self._days for key in period_keys(date.fromisoformat(day))
+        }
+        self._totals = {key: v for key, v in self._totals.items() if key in kept}
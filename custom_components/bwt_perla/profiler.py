@@ -0,0 +1,143 @@
+"""On-demand profiling of BWT Perla update cycles."""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+
+from . import api as api_module
+from .api import BwtCloudApi
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACEMALLOC_FRAMES = 25
+
+_API_FILTER = tracemalloc.Filter(True, api_module.__file__, all_frames=True)
+
+
+class UpdateProfiler:
+    """Profile a bounded number of coordinator update cycles.
+
+    The coordinator only calls into this class while cycles are armed, so an
+    idle profiler costs a single attribute check per update.
+    """
+
+    def __init__(self, hass, output_dir: str, name: str) -> None:
+        self._hass = hass
+        self._output_dir = output_dir
+        self._name = name
+        self._remaining = 0
+        self._top = 30
+        self._cycle = 0
+        self._started_tracemalloc = False
+
+    @property
+    def active(self) -> bool:
+        return self._remaining > 0
+
+    def arm(self, cycles: int, top: int) -> None:
+        """Profile the next `cycles` update cycles, keeping `top` entries."""
+        self._remaining = cycles
+        self._top = top
+        _LOGGER.info(
+            "Profiling the next %d update cycle(s) of %s into %s",
+            cycles,
+            self._name,
+            self._output_dir,
+        )
+
+    async def async_profile(
+        self, api: BwtCloudApi, fetch: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        """Run one update cycle under cProfile and tracemalloc."""
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (e.g. a second entry) is already running.
+            _LOGGER.debug("Profiler busy, running %s cycle unprofiled", self._name)
+            return await fetch()
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+
+        snapshots: list[tuple[str, tracemalloc.Snapshot]] = []
+        api.parse_observer = lambda label: snapshots.append(
+            (label, tracemalloc.take_snapshot().filter_traces((_API_FILTER,)))
+        )
+        start = time.perf_counter()
+        try:
+            return await fetch()
+        finally:
+            elapsed = time.perf_counter() - start
+            profiler.disable()
+            api.parse_observer = None
+            peak = tracemalloc.get_traced_memory()[1]
+
+            self._remaining -= 1
+            self._cycle += 1
+            if not self._remaining and self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+            # Written in the background, after the fetch has returned and
+            # released its fetch slot, so a report never affects the update
+            self._hass.async_create_background_task(
+                self._async_write_report(
+                    self._cycle, profiler, snapshots, elapsed, peak
+                ),
+                f"{self._name} profile report",
+            )
+
+    async def _async_write_report(self, cycle: int, *args) -> None:
+        try:
+            await self._hass.async_add_executor_job(self._write_report, cycle, *args)
+        except OSError as err:
+            _LOGGER.error(
+                "Could not write the profile of %s cycle %d: %s", self._name, cycle, err
+            )
+
+    def _write_report(
+        self,
+        cycle: int,
+        profiler: cProfile.Profile,
+        snapshots: list[tuple[str, tracemalloc.Snapshot]],
+        elapsed: float,
+        peak: int,
+    ) -> None:
+        """Write the pstats dump and a plain-text top-N summary."""
+        os.makedirs(self._output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        base = os.path.join(self._output_dir, f"{self._name}-{stamp}-{cycle}")
+
+        profiler.dump_stats(f"{base}.pstats")
+
+        out = io.StringIO()
+        out.write(f"{self._name} update cycle {cycle}: {elapsed * 1000:.1f} ms, ")
+        out.write(f"peak traced memory {peak / 1024:.1f} KiB\n")
+        out.write(
+            "Note: cProfile also sees other event loop work that ran while "
+            "this cycle was awaiting I/O.\n\n"
+        )
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(
+            self._top
+        )
+
+        for label, snapshot in snapshots:
+            stats = snapshot.statistics("lineno")
+            total = sum(stat.size for stat in stats)
+            out.write(
+                f"\nLive allocations after parsing {label}: {total / 1024:.1f} KiB\n"
+            )
+            for stat in stats[: self._top]:
+                out.write(f"  {stat}\n")
+
+        with open(f"{base}.txt", "w", encoding="utf-8") as summary:
+            summary.write(out.getvalue())
+
+        _LOGGER.info("Wrote profile of %s cycle %d to %s.*", self._name, cycle, base)
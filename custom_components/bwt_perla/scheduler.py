@@ -0,0 +1,63 @@
+"""Domain-wide poll scheduling for BWT Perla config entries."""
+import asyncio
+import math
+
+from .const import MAX_CONCURRENT_FETCHES
+
+
+class BWTPollScheduler:
+    """Stagger the polls of all config entries and cap concurrent fetches.
+
+    Each entry gets a slot, and each slot a phase: a fixed fraction of the
+    poll interval at which that entry ticks. Phases follow the van der
+    Corput sequence (0, 1/2, 1/4, 3/4, 1/8, ...), so entries that are added
+    fill the largest gaps and existing entries keep their phase. One instance
+    is shared through hass.data[DOMAIN].
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_FETCHES) -> None:
+        self._slots: dict[str, int] = {}
+        self.fetch_slot = asyncio.Semaphore(max_concurrent)
+
+    @property
+    def entries(self) -> list[str]:
+        return list(self._slots)
+
+    def register(self, entry_id: str) -> None:
+        """Give an entry the lowest free slot (no-op if it already has one)."""
+        if entry_id in self._slots:
+            return
+        taken = set(self._slots.values())
+        self._slots[entry_id] = next(
+            slot for slot in range(len(taken) + 1) if slot not in taken
+        )
+
+    def unregister(self, entry_id: str) -> None:
+        self._slots.pop(entry_id, None)
+
+    def phase(self, entry_id: str) -> float:
+        """Return the entry's phase as a fraction of its interval."""
+        return _van_der_corput(self._slots.get(entry_id, 0))
+
+    def next_refresh(self, entry_id: str, now: float, interval: float) -> float:
+        """Return the loop time of the entry's next tick after `now`.
+
+        Ticks sit on the grid phase * interval + k * interval. The next one
+        is at least half an interval away, so a refresh made off the grid
+        (at setup, or on request) does not cause a second one right after.
+        """
+        offset = self.phase(entry_id) * interval
+        next_tick = offset + (math.floor((now - offset) / interval) + 1) * interval
+        if next_tick - now < interval / 2:
+            next_tick += interval
+        return next_tick
+
+
+def _van_der_corput(slot: int) -> float:
+    """Return the base-2 van der Corput value of `slot`, in [0, 1)."""
+    value, denominator = 0.0, 1
+    while slot:
+        denominator *= 2
+        slot, bit = divmod(slot, 2)
+        value += bit / denominator
+    return value
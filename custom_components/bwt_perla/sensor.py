@@ -1,19 +1,45 @@
 """Sensor platform for BWT Perla integration."""
-from homeassistant.components.sensor import SensorEntity
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
-    MANUFACTURER,
     SENSOR_TYPES,
-    CONF_SERIAL_NUMBER,
-    CONF_DEVICE_NAME,
-    DEFAULT_DEVICE_NAME,
+    SENSOR_PUBLISH_POLICIES,
 )
 from .coordinator import BWTDataUpdateCoordinator
+from .history import period_start
+
+
+@dataclass(frozen=True, kw_only=True)
+class BWTSensorEntityDescription(SensorEntityDescription):
+    """Describes a BWT sensor."""
+
+    # Calendar period of a period total ("day", "week", ...), if any
+    period: str | None = None
+
+
+# Built once at import and shared by the entities of every device
+SENSOR_DESCRIPTIONS = tuple(
+    BWTSensorEntityDescription(
+        key=sensor_type,
+        name=sensor_info["name"],
+        has_entity_name=True,
+        native_unit_of_measurement=sensor_info["unit"],
+        icon=sensor_info["icon"],
+        device_class=sensor_info.get("device_class"),
+        state_class=sensor_info.get("state_class"),
+        period=sensor_info.get("period"),
+    )
+    for sensor_type, sensor_info in SENSOR_TYPES.items()
+)
 
 
 async def async_setup_entry(
@@ -25,45 +51,160 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][entry.entry_id]
 
     async_add_entities(
-        BWTSensor(coordinator, entry, sensor_type) for sensor_type in SENSOR_TYPES
+        BWTSensor(coordinator, description) for description in SENSOR_DESCRIPTIONS
     )
 
 
+class _PublishState:
+    """Publish policy bookkeeping of one sensor (see SENSOR_PUBLISH_POLICIES)."""
+
+    __slots__ = (
+        "policy",
+        "published_value",
+        "seen_value",
+        "published_available",
+        "last_publish",
+        "suppressed_writes",
+        "unsub_settle",
+    )
+
+    def __init__(self, policy: dict, value, now: float) -> None:
+        self.policy = policy
+        self.published_value = value
+        self.seen_value = value
+        self.published_available = True
+        self.last_publish = now
+        self.suppressed_writes = 0
+        self.unsub_settle = None
+
+
 class BWTSensor(CoordinatorEntity, SensorEntity):
     """Representation of a BWT sensor."""
 
+    entity_description: BWTSensorEntityDescription
+    # Changes on every publish; keep it out of the recorder
+    _unrecorded_attributes = frozenset({"suppressed_writes"})
+
     def __init__(
         self,
         coordinator: BWTDataUpdateCoordinator,
-        entry: ConfigEntry,
-        sensor_type: str,
+        description: BWTSensorEntityDescription,
     ) -> None:
         super().__init__(coordinator)
-        self._sensor_type = sensor_type
-        self._serial_number = entry.data[CONF_SERIAL_NUMBER]
-        self._device_name = entry.data.get(CONF_DEVICE_NAME, DEFAULT_DEVICE_NAME)
-        self._attr_unique_id = f"{self._serial_number}_{sensor_type}"
-
-        sensor_info = SENSOR_TYPES[sensor_type]
-        self._attr_name = f"{self._device_name} {sensor_info['name']}"
-        self._attr_native_unit_of_measurement = sensor_info["unit"]
-        self._attr_icon = sensor_info["icon"]
-        self._attr_device_class = sensor_info.get("device_class")
-        self._attr_state_class = sensor_info.get("state_class")
-
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, self._serial_number)},
-            "name": self._device_name,
-            "manufacturer": MANUFACTURER,
-            "model": "My Perla Optimum",
-        }
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.serial_number}_{description.key}"
+        self._attr_device_info = coordinator.device_info
+
+        # Only throttled sensors carry publish state
+        self._publish_state = None
+        policy = SENSOR_PUBLISH_POLICIES.get(description.key)
+        if policy is not None:
+            self._publish_state = _PublishState(
+                policy, self._current_value(), coordinator.hass.loop.time()
+            )
+
+    def _current_value(self):
+        """Return the latest value from the coordinator."""
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.get(self.entity_description.key)
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if self.coordinator.data is None:
+        if self._publish_state is not None:
+            return self._publish_state.published_value
+        return self._current_value()
+
+    @property
+    def last_reset(self):
+        """Return the start of the current period for period totals."""
+        period = self.entity_description.period
+        if period is None:
             return None
-        return self.coordinator.data.get(self._sensor_type)
+        return dt_util.start_of_local_day(period_start(period, dt_util.now().date()))
+
+    @property
+    def extra_state_attributes(self):
+        """Report how many state writes the publish policy suppressed."""
+        if self._publish_state is None:
+            return None
+        return {"suppressed_writes": self._publish_state.suppressed_writes}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state, unless the publish policy suppresses the change."""
+        state = self._publish_state
+        if state is None:
+            super()._handle_coordinator_update()
+            return
+
+        value = self._current_value()
+        now = self.hass.loop.time()
+        if self.available != state.published_available or self._should_publish(
+            value, now
+        ):
+            self._publish(value, now)
+            return
+        if value == state.published_value:
+            # Back to the published value: nothing to write or settle
+            state.seen_value = value
+            self._cancel_settle()
+            return
+
+        state.suppressed_writes += 1
+        if value != state.seen_value:
+            # Publish the value once it has settled for min_interval
+            state.seen_value = value
+            self._cancel_settle()
+            state.unsub_settle = async_call_later(
+                self.hass, state.policy["min_interval"], self._async_settle
+            )
+
+    def _should_publish(self, value, now: float) -> bool:
+        state = self._publish_state
+        published = state.published_value
+        if value == published:
+            return False
+        if now - state.last_publish < state.policy["min_interval"]:
+            return False
+        if not isinstance(value, (int, float)) or not isinstance(
+            published, (int, float)
+        ):
+            return True
+        threshold = max(
+            state.policy["deadband"],
+            state.policy["relative_deadband"] * abs(published),
+        )
+        return abs(value - published) > threshold
+
+    @callback
+    def _publish(self, value, now: float) -> None:
+        state = self._publish_state
+        self._cancel_settle()
+        state.published_value = value
+        state.seen_value = value
+        state.published_available = self.available
+        state.last_publish = now
+        self.async_write_ha_state()
+
+    @callback
+    def _async_settle(self, _now) -> None:
+        state = self._publish_state
+        state.unsub_settle = None
+        if state.seen_value != state.published_value:
+            self._publish(state.seen_value, self.hass.loop.time())
+
+    def _cancel_settle(self) -> None:
+        state = self._publish_state
+        if state is not None and state.unsub_settle is not None:
+            state.unsub_settle()
+            state.unsub_settle = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending settle publish."""
+        self._cancel_settle()
+        await super().async_will_remove_from_hass()
 
     @property
     def available(self) -> bool:
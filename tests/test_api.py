@@ -0,0 +1,78 @@
+"""Tests for the BWT cloud API client's transparent re-login."""
+import asyncio
+
+import pytest
+
+from custom_components.bwt_perla.api import BwtAuthError, BwtCloudApi
+from custom_components.bwt_perla.const import BWT_LOGIN_URL
+
+SUMMARY = {"online": True, "data": {"standBy": False, "salt": 90}}
+
+
+class FakeResponse:
+    def __init__(self, status: int, payload=None) -> None:
+        self.status = status
+        self._payload = payload
+
+    async def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Cloud whose session is valid until `expire()` and renewed by a login.
+
+    The response status is decided when a request arrives and the request
+    then yields to the loop, so concurrent callers all see an expired
+    session before any of them logs in again.
+    """
+
+    def __init__(self, renew: bool = True) -> None:
+        self.logins = 0
+        self.valid = False
+        self.renew = renew
+
+    def expire(self) -> None:
+        self.valid = False
+
+    async def request(self, method, url, **kwargs):
+        if url == BWT_LOGIN_URL:
+            await asyncio.sleep(0)
+            self.logins += 1
+            self.valid = self.renew
+            return FakeResponse(200)
+        status = 200 if self.valid else 401
+        await asyncio.sleep(0)
+        return FakeResponse(status, SUMMARY)
+
+
+def test_concurrent_expired_requests_share_one_login():
+    async def run():
+        session = FakeSession()
+        api = BwtCloudApi(session, "user", "secret")
+        await api.login()
+        session.expire()
+
+        results = await asyncio.gather(
+            *(api.get_main_data(f"key{index}") for index in range(10))
+        )
+        return session.logins, results
+
+    logins, results = asyncio.run(run())
+
+    assert logins == 2  # the initial login and exactly one re-login
+    assert all(result["online"] for result in results)
+
+
+def test_request_still_rejected_after_relogin_raises_auth_error():
+    async def run():
+        session = FakeSession(renew=False)
+        api = BwtCloudApi(session, "user", "secret")
+        await api.login()
+        with pytest.raises(BwtAuthError):
+            await api.get_main_data("key")
+        return session.logins, api.authenticated
+
+    logins, authenticated = asyncio.run(run())
+
+    assert logins == 2
+    assert not authenticated
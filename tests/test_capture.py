@@ -0,0 +1,149 @@
+"""Tests for cloud traffic capture and replay."""
+import asyncio
+import json
+import time
+
+from custom_components.bwt_perla.api import BwtCloudApi
+from custom_components.bwt_perla.capture import (
+    REDACTED,
+    ReplaySession,
+    TrafficRecorder,
+    load_recordings,
+)
+from custom_components.bwt_perla.const import BWT_LOGIN_URL, BWT_SUMMARY_URL
+
+USERNAME = "someone@example.com"
+PASSWORD = "hunter2-secret"
+SUMMARY = {"online": True, "data": {"standBy": False, "salt": 90}}
+
+
+class FakeResponse:
+    def __init__(self, status: int, body: str, url: str, headers=None) -> None:
+        self.status = status
+        self.url = url
+        self.headers = headers or {}
+        self._body = body.encode("utf-8")
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def json(self):
+        return json.loads(self._body)
+
+
+class FakeSession:
+    """Answer requests from a script of (status, body, headers) per URL."""
+
+    def __init__(self, script: dict[str, list[tuple]]) -> None:
+        self._script = {url: list(replies) for url, replies in script.items()}
+
+    async def request(self, method, url, **kwargs):
+        status, body, headers = self._script[url].pop(0)
+        return FakeResponse(status, body, url, headers)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_credentials_and_cookies_are_redacted(tmp_path):
+    recorder = TrafficRecorder(str(tmp_path))
+    session = FakeSession(
+        {
+            BWT_LOGIN_URL: [
+                (
+                    200,
+                    f"<p>Welcome {USERNAME}</p><input value='{PASSWORD}'>",
+                    {"Set-Cookie": "PHPSESSID=abc123", "Content-Type": "text/html"},
+                )
+            ]
+        }
+    )
+    api = BwtCloudApi(session, USERNAME, PASSWORD, capture=recorder)
+
+    async def exchange():
+        await api.login()
+        await recorder.async_record(
+            "GET",
+            BWT_LOGIN_URL,
+            {"headers": {"Cookie": "PHPSESSID=abc123", "Accept": "text/html"}},
+            time.monotonic(),
+            (USERNAME, PASSWORD),
+            error=TimeoutError(),
+        )
+
+    run(exchange())
+
+    raw = "".join(path.read_text() for path in tmp_path.iterdir())
+    assert USERNAME not in raw
+    assert PASSWORD not in raw
+    assert "abc123" not in raw
+
+    login, cookie_request = load_recordings(str(tmp_path))
+    assert login["data"] == {"_username": REDACTED, "_password": REDACTED}
+    assert login["response_headers"]["Set-Cookie"] == REDACTED
+    assert login["response_headers"]["Content-Type"] == "text/html"
+    assert login["body"] == f"<p>Welcome {REDACTED}</p><input value='{REDACTED}'>"
+    assert cookie_request["request_headers"] == {
+        "Cookie": REDACTED,
+        "Accept": "text/html",
+    }
+    assert cookie_request["error"] == "timeout"
+
+
+def test_segment_rotation_keeps_at_most_segments_files(tmp_path):
+    recorder = TrafficRecorder(str(tmp_path), max_bytes=600, segments=3)
+    for index in range(50):
+        recorder._write(json.dumps({"ts": index, "pad": "x" * 40}) + "\n")
+
+    files = sorted(path.name for path in tmp_path.iterdir())
+    assert len(files) == 3
+    # The ring holds the newest records, in order, ending with the last one
+    timestamps = [record["ts"] for record in load_recordings(str(tmp_path))]
+    assert timestamps == list(range(timestamps[0], 50))
+
+    # A new recorder resumes the newest segment instead of starting over
+    TrafficRecorder(str(tmp_path), max_bytes=600, segments=3)._write(
+        json.dumps({"ts": 50}) + "\n"
+    )
+    assert len(list(tmp_path.iterdir())) == 3
+    assert load_recordings(str(tmp_path))[-1]["ts"] == 50
+
+
+def test_replay_of_an_expired_session_relogin_and_retry(tmp_path):
+    summary_url = f"{BWT_SUMMARY_URL}/key"
+    session = FakeSession(
+        {
+            BWT_LOGIN_URL: [(200, "", {}), (200, "", {})],
+            summary_url: [
+                (401, "", {}),
+                (200, json.dumps(SUMMARY), {"Content-Type": "application/json"}),
+            ],
+        }
+    )
+    recorder = TrafficRecorder(str(tmp_path))
+    api = BwtCloudApi(session, USERNAME, PASSWORD, capture=recorder)
+
+    async def record():
+        await api.login()
+        return await api.get_main_data("key")
+
+    recorded = run(record())
+
+    recordings = load_recordings(str(tmp_path))
+    assert [(r["url"], r["status"]) for r in recordings] == [
+        (BWT_LOGIN_URL, 200),
+        (summary_url, 401),
+        (BWT_LOGIN_URL, 200),
+        (summary_url, 200),
+    ]
+
+    replay = ReplaySession(recordings, speed=0)
+    replay_api = BwtCloudApi(replay, REDACTED, REDACTED)
+
+    async def replayed():
+        await replay_api.login()
+        return await replay_api.get_main_data("key")
+
+    assert run(replayed()) == recorded
+    assert replay.remaining == 0
@@ -0,0 +1,125 @@
+"""Tests for the coordinator's persisted history and event state."""
+import asyncio
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.core import HomeAssistant, callback  # noqa: E402
+
+from custom_components.bwt_perla import async_remove_entry  # noqa: E402
+from custom_components.bwt_perla.const import (  # noqa: E402
+    DOMAIN,
+    EVENT_BWT_PERLA,
+)
+from custom_components.bwt_perla.coordinator import (  # noqa: E402
+    BWTDataUpdateCoordinator,
+)
+from custom_components.bwt_perla.scheduler import BWTPollScheduler  # noqa: E402
+
+ENTRY_ID = "test-entry"
+MAIN_DATA = {"online": True, "standby": False, "salt": 90, "pressure": 3.5}
+
+TODAY = date.today()
+YESTERDAY = TODAY - timedelta(days=1)
+
+
+def line(day: date, alarm: bool = False) -> tuple:
+    """Return a parsed loadConso line."""
+    return (day.isoformat(), 1, False, 200, alarm)
+
+
+def make_coordinator(hass, history: list) -> BWTDataUpdateCoordinator:
+    """Build a coordinator whose API serves `history` without network."""
+    entry = SimpleNamespace(
+        entry_id=ENTRY_ID,
+        title="Test",
+        data={"username": "u", "password": "p", "serial_number": "TEST-0001"},
+        options={},
+        pref_disable_polling=False,
+    )
+    coordinator = BWTDataUpdateCoordinator(hass, entry, BWTPollScheduler())
+
+    async def authenticate():
+        return "receipt-line-key"
+
+    async def get_main_data(_key):
+        return dict(MAIN_DATA)
+
+    async def get_consumption_data(_key):
+        return {
+            "salt_per_regen": 90,
+            "water_consumption": history[0][3],
+            "history": list(history),
+        }
+
+    coordinator.api.authenticate = authenticate
+    coordinator.api.get_main_data = get_main_data
+    coordinator.api.get_consumption_data = get_consumption_data
+    return coordinator
+
+
+async def poll(coordinator: BWTDataUpdateCoordinator) -> None:
+    coordinator.data = await coordinator._async_update_data()
+
+
+def run_with_hass(tmp_path, test):
+    """Run `test(hass)` against a Home Assistant instance in `tmp_path`."""
+
+    async def main():
+        hass = HomeAssistant(str(tmp_path))
+        try:
+            return await test(hass)
+        finally:
+            await hass.async_stop(force=True)
+
+    return asyncio.run(main())
+
+
+def test_removed_entry_storage_is_not_written_back(tmp_path):
+    storage_file = tmp_path / ".storage" / f"{DOMAIN}.{ENTRY_ID}"
+
+    async def test(hass):
+        coordinator = make_coordinator(hass, [line(TODAY), line(YESTERDAY)])
+        await poll(coordinator)  # schedules a delayed save
+
+        # Unload, then remove, while the delayed save is still pending
+        await coordinator.async_shutdown()
+        assert storage_file.exists()
+        await async_remove_entry(hass, coordinator.entry)
+        await hass.async_block_till_done()
+        assert not storage_file.exists()
+
+    # Stopping fires the final write, which flushes any pending save
+    run_with_hass(tmp_path, test)
+    assert not storage_file.exists()
+
+
+def test_event_fired_before_a_reload_is_not_fired_again(tmp_path):
+    async def test(hass):
+        events = []
+        hass.bus.async_listen(EVENT_BWT_PERLA, callback(events.append))
+
+        history = [line(YESTERDAY)]
+        coordinator = make_coordinator(hass, history)
+        await poll(coordinator)  # seeds the watermark
+        # As when that poll's delayed save has run
+        await coordinator._store.async_save(coordinator._data_to_store())
+
+        history.insert(0, line(TODAY, alarm=True))
+        await poll(coordinator)
+        await hass.async_block_till_done()
+        assert [event.data["type"] for event in events] == ["salt_alarm"]
+
+        # Reload well within the delayed save
+        await coordinator.async_shutdown()
+        reloaded = make_coordinator(hass, history)
+        await poll(reloaded)
+        await hass.async_block_till_done()
+        await reloaded.async_shutdown()
+
+        assert len(events) == 1
+
+    run_with_hass(tmp_path, test)
@@ -0,0 +1,64 @@
+"""Tests for salt-alarm and power-outage event detection."""
+from custom_components.bwt_perla.events import EventTracker
+
+
+def line(day: str, outage: bool = False, alarm: bool = False) -> tuple:
+    """Return a parsed loadConso line."""
+    return (day, 0, outage, 100, alarm)
+
+
+def test_first_scan_seeds_without_firing():
+    tracker = EventTracker()
+
+    events = tracker.scan(
+        [line("2026-10-05"), line("2026-10-04", alarm=True), line("2026-10-03")]
+    )
+
+    assert events == []
+    assert tracker.last_occurrence == {"power_outage": None, "salt_alarm": "2026-10-04"}
+
+
+def test_new_days_fire_oldest_first_and_older_days_are_not_rescanned():
+    tracker = EventTracker()
+    tracker.scan([line("2026-10-05")])
+
+    events = tracker.scan(
+        [
+            line("2026-10-07", alarm=True),
+            line("2026-10-06", outage=True),
+            line("2026-10-05"),
+            # Below the watermark: already scanned, never fires
+            line("2026-10-04", alarm=True),
+        ]
+    )
+
+    assert events == [("power_outage", "2026-10-06"), ("salt_alarm", "2026-10-07")]
+
+
+def test_watermark_day_flagged_later_fires_exactly_once():
+    tracker = EventTracker()
+    tracker.scan([line("2026-10-05")])
+
+    # The cloud flags the newest day on a later poll
+    assert tracker.scan([line("2026-10-05", alarm=True)]) == [
+        ("salt_alarm", "2026-10-05")
+    ]
+    assert tracker.scan([line("2026-10-05", alarm=True)]) == []
+
+    # Also across a restart, from the persisted state
+    restored = EventTracker(tracker.as_dict())
+    assert restored.scan([line("2026-10-05", alarm=True)]) == []
+    assert restored.scan([line("2026-10-05", outage=True, alarm=True)]) == [
+        ("power_outage", "2026-10-05")
+    ]
+
+
+def test_as_dict_is_a_snapshot():
+    tracker = EventTracker()
+    tracker.scan([line("2026-10-05")])
+    before = tracker.as_dict()
+
+    tracker.scan([line("2026-10-05", alarm=True)])
+
+    assert before["last_occurrence"]["salt_alarm"] is None
+    assert tracker.as_dict() != before
@@ -0,0 +1,95 @@
+"""Tests for the calendar-period consumption totals."""
+from datetime import date
+
+from custom_components.bwt_perla.history import ConsumptionHistory
+
+SALT_PER_REGEN = 90
+
+
+def line(day: str, water: int, regen: int = 0) -> tuple:
+    """Return a parsed loadConso line."""
+    return (day, regen, False, water, False)
+
+
+def test_correction_changes_only_the_periods_containing_the_day():
+    history = ConsumptionHistory()
+    # Wednesday of ISO week 40 in September, Monday of week 41 in October
+    history.ingest(
+        [line("2026-10-05", 200, 1), line("2026-09-30", 100, 1)],
+        SALT_PER_REGEN,
+        date(2026, 10, 5),
+    )
+    october_before = history.totals(date(2026, 10, 5))
+
+    # The cloud revises the September day
+    changed = history.ingest(
+        [line("2026-10-05", 200, 1), line("2026-09-30", 150, 2)],
+        SALT_PER_REGEN,
+        date(2026, 10, 5),
+    )
+
+    assert changed
+    october = history.totals(date(2026, 10, 5))
+    for period in ("day", "week", "month"):
+        for quantity in ("water", "regen", "salt"):
+            key = f"{quantity}_{period}"
+            assert october[key] == october_before[key]
+    assert october["water_year"] == october_before["water_year"] + 50
+    assert october["salt_year"] == october_before["salt_year"] + SALT_PER_REGEN
+
+    september = history.totals(date(2026, 9, 30))
+    assert september["water_day"] == 150
+    assert september["water_week"] == 150
+    assert september["water_month"] == 150
+    assert september["regen_month"] == 2
+
+
+def test_unchanged_lines_report_no_change():
+    history = ConsumptionHistory()
+    lines = [line("2026-10-05", 200, 1)]
+    assert history.ingest(lines, SALT_PER_REGEN, date(2026, 10, 5))
+    assert not history.ingest(lines, SALT_PER_REGEN, date(2026, 10, 5))
+
+
+def test_salt_is_priced_at_ingest_time():
+    history = ConsumptionHistory()
+    history.ingest([line("2026-10-04", 100, 1)], 90, date(2026, 10, 5))
+    history.ingest(
+        [line("2026-10-05", 100, 1), line("2026-10-04", 100, 1)],
+        120,
+        date(2026, 10, 5),
+    )
+
+    assert history.totals(date(2026, 10, 5))["salt_month"] == 90 + 120
+
+
+def test_totals_rebuilt_from_days_match_running_totals():
+    history = ConsumptionHistory()
+    history.ingest(
+        [line("2025-08-01", 70, 1), line("2025-07-31", 30)],
+        SALT_PER_REGEN,
+        date(2025, 8, 1),
+    )
+    history.ingest(
+        [
+            line("2026-09-01", 120, 1),
+            line("2026-08-31", 80),
+            line("2025-08-01", 90, 2),  # late correction
+        ],
+        SALT_PER_REGEN,
+        date(2026, 9, 1),
+    )
+    # Moving the retention window drops July and August 2025
+    history.ingest([], SALT_PER_REGEN, date(2026, 9, 15))
+    assert min(history.days) == "2026-08-31"
+
+    rebuilt = ConsumptionHistory(history.days)
+
+    for today in (
+        date(2025, 8, 1),
+        date(2026, 8, 31),
+        date(2026, 9, 1),
+        date(2026, 9, 15),
+    ):
+        assert rebuilt.totals(today) == history.totals(today)
+    assert history.totals(date(2025, 8, 1))["water_year"] == 0
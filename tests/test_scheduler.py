@@ -0,0 +1,52 @@
+"""Tests for the domain-wide poll scheduler."""
+import pytest
+
+from custom_components.bwt_perla.scheduler import BWTPollScheduler
+
+
+def test_phases_fill_the_largest_gaps_and_stay_put():
+    scheduler = BWTPollScheduler()
+    for entry_id in ("a", "b", "c", "d"):
+        scheduler.register(entry_id)
+
+    assert [scheduler.phase(e) for e in ("a", "b", "c", "d")] == [
+        0.0,
+        0.5,
+        0.25,
+        0.75,
+    ]
+
+    # A removed entry's slot is reused; the others keep their phase
+    scheduler.unregister("b")
+    scheduler.register("e")
+    assert scheduler.phase("e") == 0.5
+    assert scheduler.phase("c") == 0.25
+    assert sorted(scheduler.entries) == ["a", "c", "d", "e"]
+
+
+def test_register_twice_keeps_the_slot():
+    scheduler = BWTPollScheduler()
+    scheduler.register("a")
+    scheduler.register("b")
+    scheduler.register("b")
+
+    assert scheduler.phase("b") == 0.5
+    assert len(scheduler.entries) == 2
+
+
+@pytest.mark.parametrize(
+    ("now", "expected"),
+    [
+        (10.0, 150.0),  # the tick at 50 is too close to an off-grid refresh
+        (60.0, 150.0),
+        (140.0, 250.0),
+    ],
+)
+def test_next_refresh_is_on_the_grid_and_at_least_half_an_interval_away(
+    now, expected
+):
+    scheduler = BWTPollScheduler()
+    scheduler.register("a")
+    scheduler.register("b")  # phase 0.5
+
+    assert scheduler.next_refresh("b", now, 100.0) == expected
@@ -0,0 +1,132 @@
+"""Tests for the publish policies of throttled sensors."""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.bwt_perla import sensor as sensor_module  # noqa: E402
+from custom_components.bwt_perla.sensor import (  # noqa: E402
+    SENSOR_DESCRIPTIONS,
+    BWTSensor,
+)
+
+# wifi_signal: deadband 3, min_interval 900 s
+DESCRIPTION = next(d for d in SENSOR_DESCRIPTIONS if d.key == "wifi_signal")
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def time(self) -> float:
+        return self.now
+
+
+class StubCoordinator:
+    def __init__(self, hass, value) -> None:
+        self.hass = hass
+        self.data = {"wifi_signal": value}
+        self.last_update_success = True
+        self.serial_number = "TEST-0001"
+        self.device_info = None
+
+
+class Timers:
+    """Stand-in for async_call_later that fires callbacks on demand."""
+
+    def __init__(self) -> None:
+        self.pending = []
+
+    def call_later(self, _hass, delay, action):
+        timer = SimpleNamespace(delay=delay, action=action, cancelled=False)
+        self.pending.append(timer)
+
+        def cancel() -> None:
+            timer.cancelled = True
+
+        return cancel
+
+    def fire(self) -> None:
+        timers, self.pending = self.pending, []
+        for timer in timers:
+            if not timer.cancelled:
+                timer.action(None)
+
+
+@pytest.fixture
+def harness(monkeypatch):
+    clock = Clock()
+    timers = Timers()
+    monkeypatch.setattr(sensor_module, "async_call_later", timers.call_later)
+    hass = SimpleNamespace(loop=clock)
+    coordinator = StubCoordinator(hass, -60)
+
+    entity = BWTSensor(coordinator, DESCRIPTION)
+    entity.hass = hass
+    writes = []
+    entity.async_write_ha_state = lambda: writes.append(entity.native_value)
+
+    def update(value, at: float) -> None:
+        clock.now = at
+        coordinator.data = {"wifi_signal": value}
+        entity._handle_coordinator_update()
+
+    return SimpleNamespace(
+        entity=entity,
+        coordinator=coordinator,
+        clock=clock,
+        timers=timers,
+        writes=writes,
+        update=update,
+    )
+
+
+def test_changes_inside_the_deadband_are_suppressed_and_counted(harness):
+    harness.update(-62, at=1000)
+    harness.update(-58, at=2000)
+
+    assert harness.writes == []
+    assert harness.entity.native_value == -60
+    assert harness.entity.extra_state_attributes == {"suppressed_writes": 2}
+
+
+def test_change_outside_the_deadband_is_published_after_min_interval(harness):
+    harness.update(-70, at=100)
+    assert harness.writes == []
+
+    harness.update(-70, at=1000)
+    assert harness.writes == [-70]
+    assert harness.entity.native_value == -70
+
+
+def test_settled_value_is_published_by_the_timer(harness):
+    harness.update(-62, at=1000)
+    assert [timer.delay for timer in harness.timers.pending] == [900]
+
+    harness.clock.now = 1900
+    harness.timers.fire()
+
+    assert harness.writes == [-62]
+    assert harness.entity.native_value == -62
+
+
+def test_return_to_the_published_value_cancels_the_settle_timer(harness):
+    harness.update(-62, at=1000)
+    harness.update(-60, at=1100)
+
+    harness.timers.fire()
+
+    assert harness.writes == []
+
+
+def test_availability_flip_is_always_published(harness):
+    harness.coordinator.last_update_success = False
+    harness.update(-60, at=10)
+    assert len(harness.writes) == 1
+    assert not harness.entity.available
+
+    harness.coordinator.last_update_success = True
+    harness.update(-60, at=20)
+    assert len(harness.writes) == 2
+    assert harness.entity.available